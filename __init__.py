@@ -11,7 +11,9 @@ from agents.deep_agents import (
     FactCheckingAgent,
     AGENTS,
     WORKFLOW_ORDER,
+    WORKFLOW_DAG,
 )
+from agents.scheduler import run_dag
 from deepresearch import DeepResearchWorkflow, WorkflowState
 
 __all__ = [
@@ -25,6 +27,8 @@ __all__ = [
     "FactCheckingAgent",
     "AGENTS",
     "WORKFLOW_ORDER",
+    "WORKFLOW_DAG",
+    "run_dag",
     "DeepResearchWorkflow",
     "WorkflowState",
 ]
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""Micro-batching of concurrent agent requests across workflows.
+
+Batched requests share one prompt, so the model sees every input in the
+batch while answering each one. Only batch agents whose inputs may be seen
+together, for example when all workflows in the process serve one user.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from agents.cache import AgentWrapper
+
+BatchHandler = Callable[[List[str]], Awaitable[List[str]]]
+
+BATCH_MAX_SIZE = 8
+BATCH_WINDOW_MS = 10
+
+# Agents that concurrent workflows call at the same time with self-contained
+# inputs; their batches mix inputs from different workflows (see module docstring)
+BATCHED_AGENTS = frozenset({"ReviewAgent", "SummaryAgent"})
+
+
+class BatchProcessor:
+    """Collects requests arriving within a short window and resolves them with one call.
+
+    A batch is flushed when ``max_batch`` requests are pending or ``window_ms``
+    milliseconds after the first pending request, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        max_batch: int = BATCH_MAX_SIZE,
+        window_ms: float = BATCH_WINDOW_MS,
+    ):
+        self._handler = handler
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[str, "asyncio.Future[str]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, so running batches are held here
+        self._running: Set["asyncio.Task[None]"] = set()
+
+    async def submit(self, item: str) -> str:
+        """Queue ``item`` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[str]" = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[str, "asyncio.Future[str]"]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_BATCH_SCHEMA: Dict[str, Any] = {
+    "name": "batched_responses",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"responses": {"type": "array", "items": {"type": "string"}}},
+        "required": ["responses"],
+        "additionalProperties": False,
+    },
+}
+
+
+async def _run_batch(agent: Any, inputs: List[str]) -> List[str]:
+    """Answer several inputs for ``agent`` with a single LLM call.
+
+    A single input runs through the agent as usual. If the merged call does
+    not return one response per input, each input is run on its own.
+    """
+    if len(inputs) == 1:
+        return [str(await agent.run(inputs[0]))]
+
+    from llama_index.core.llms import ChatMessage
+
+    requests = "\n\n".join(
+        f"<<<REQUEST {i}>>>\n{text}\n<<</REQUEST {i}>>>" for i, text in enumerate(inputs)
+    )
+    response = await agent.llm.achat(
+        [
+            ChatMessage(role="system", content=agent.system_prompt),
+            ChatMessage(
+                role="user",
+                content=(
+                    f"Handle each of the following {len(inputs)} independent requests "
+                    "separately and return the responses in the same order.\n\n" + requests
+                ),
+            ),
+        ],
+        response_format={"type": "json_schema", "json_schema": _BATCH_SCHEMA},
+    )
+    try:
+        responses = json.loads(response.message.content)["responses"]
+    except (ValueError, KeyError, TypeError):
+        responses = []
+    if len(responses) == len(inputs):
+        return responses
+    return [str(r) for r in await asyncio.gather(*(agent.run(text) for text in inputs))]
+
+
+class BatchedAgent(AgentWrapper):
+    """Agent whose ``run`` waits for a slot in its own :class:`BatchProcessor`."""
+
+    __slots__ = ("batcher",)
+
+    def __init__(self, agent: Any):
+        super().__init__(agent)
+        self.batcher = BatchProcessor(lambda inputs: _run_batch(agent, inputs))
+
+    async def run(self, user_msg: str) -> str:
+        return await self.batcher.submit(user_msg)
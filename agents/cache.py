@@ -0,0 +1,186 @@
+"""Caches of agent responses.
+
+An on-disk cache serves deterministic (temperature 0) runs; an in-memory
+similarity cache serves near-identical inputs within one workflow run.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple
+
+CACHE_DIR = Path(".cache/agents")
+CACHE_TTL_SECONDS = 86400
+
+SIMILARITY_CACHE_SIZE = 64
+SIMILARITY_THRESHOLD = 0.98
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def response_cache_key(
+    system_prompt: str,
+    llm: str,
+    user_input: str,
+    temperature: float,
+    tools: Tuple[str, ...] = (),
+) -> str:
+    """Return the cache key for a prompt; byte-identical inputs give identical keys."""
+    payload = f"{system_prompt}|{llm}|{','.join(tools)}|{user_input}|{temperature}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write(path: Path, response: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"response": response}), encoding="utf-8")
+
+
+async def cached_run(
+    agent: Any,
+    user_input: str,
+    *,
+    temperature: float = 0,
+    tools: Tuple[str, ...] = (),
+) -> str:
+    """
+    Run a FunctionAgent, serving repeated deterministic prompts from disk.
+
+    Only temperature-0 runs are cached, since other runs are not reproducible.
+
+    Args:
+        agent: Built FunctionAgent
+        user_input: User message for the agent
+        temperature: Sampling temperature the agent's LLM uses
+        tools: Names of the tools the agent can call
+
+    Returns:
+        The agent's response text
+    """
+    model = getattr(getattr(agent, "llm", None), "model", "")
+    key = response_cache_key(agent.system_prompt, model, user_input, temperature, tools)
+    path = CACHE_DIR / f"{key}.json"
+
+    if temperature == 0:
+        hit = await asyncio.to_thread(_read, path)
+        if hit is not None:
+            return hit
+
+    response = str(await agent.run(user_input))
+
+    if temperature == 0:
+        await asyncio.to_thread(_write, path, response)
+    return response
+
+
+class AgentWrapper:
+    """Wraps a built FunctionAgent, passing every attribute but ``run`` through to it."""
+
+    __slots__ = ("agent",)
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.agent, name)
+
+
+class CachedAgent(AgentWrapper):
+    """Agent whose ``run`` goes through :func:`cached_run`."""
+
+    __slots__ = ("temperature", "tools")
+
+    def __init__(self, agent: Any, temperature: float, tools: Tuple[str, ...] = ()):
+        super().__init__(agent)
+        self.temperature = temperature
+        self.tools = tools
+
+    async def run(self, user_msg: str) -> str:
+        return await cached_run(
+            self.agent, user_msg, temperature=self.temperature, tools=self.tools
+        )
+
+
+def _term_vector(text: str) -> Tuple[Counter, float]:
+    """Return the word counts of ``text`` and their Euclidean norm."""
+    counts = Counter(_WORD_RE.findall(text.lower()))
+    return counts, math.sqrt(sum(n * n for n in counts.values()))
+
+
+class SimilarityCache:
+    """Small in-memory cache returning earlier responses for near-identical inputs.
+
+    Inputs are compared by cosine similarity of their word counts; the oldest
+    entry is evicted once ``maxsize`` entries are stored.
+    """
+
+    __slots__ = ("_entries", "threshold")
+
+    def __init__(self, maxsize: int = SIMILARITY_CACHE_SIZE, threshold: float = SIMILARITY_THRESHOLD):
+        self._entries: Deque[Tuple[Counter, float, str]] = deque(maxlen=maxsize)
+        self.threshold = threshold
+
+    def get(self, text: str) -> Optional[str]:
+        """Return the response stored for the most similar input above the threshold."""
+        counts, norm = _term_vector(text)
+        if not norm:
+            return None
+        best, best_score = None, self.threshold
+        for other, other_norm, response in self._entries:
+            dot = sum(n * other[word] for word, n in counts.items())
+            score = dot / (norm * other_norm)
+            if score >= best_score:
+                best, best_score = response, score
+        return best
+
+    def put(self, text: str, response: str) -> None:
+        counts, norm = _term_vector(text)
+        if norm:
+            self._entries.append((counts, norm, response))
+
+
+async def deduplicated_run(
+    run: Callable[[str], Awaitable[str]],
+    user_input: str,
+    cache: SimilarityCache,
+    *,
+    iteration: Optional[int] = None,
+) -> str:
+    """
+    Call ``run``, reusing its response to a near-identical earlier input.
+
+    ``cache`` should belong to a single workflow run, so a response is never
+    served for another workflow's input. The first iteration always reaches
+    ``run`` so a poor first draft is never waved through; its response is
+    still stored for later iterations.
+
+    Args:
+        run: Async callable returning the response for an input
+        user_input: Input for ``run``
+        cache: Similarity cache of the current workflow run
+        iteration: Review iteration the call belongs to, if any
+
+    Returns:
+        The response text
+    """
+    if iteration != 0:
+        hit = cache.get(user_input)
+        if hit is not None:
+            return hit
+
+    response = await run(user_input)
+    cache.put(user_input, response)
+    return response
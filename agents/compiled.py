@@ -0,0 +1,108 @@
+"""Single-call fast path running the whole agent workflow as one structured request."""
+
+import json
+import re
+import sys
+from typing import Any, Dict, Final
+
+from agents.registry import AGENT_SPECS
+from models.agent import _llm_server
+
+# Topics shorter than this are small enough to research in one call
+COMPILED_MAX_TOPIC_CHARS: Final[int] = 200
+
+# Topics about recent events need live web results, which the compiled call cannot fetch
+_WEB_SEARCH_RE = re.compile(
+    r"\b(?:latest|recent(?:ly)?|current(?:ly)?|today|news|this (?:week|month|year)|20[2-9]\d)\b",
+    re.IGNORECASE,
+)
+
+# Stage outputs returned by the compiled call, with the spec whose prompt governs each
+COMPILED_STAGES: Final[Dict[str, str]] = {
+    "plan": "planning",
+    "notes": "research",
+    "report": "write",
+    "review": "review",
+    "revision": "revision",
+    "formatted": "formatting",
+    "summary": "summary",
+}
+
+WORKFLOW_SCHEMA: Final[Dict[str, Any]] = {
+    "name": "research_workflow",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {stage: {"type": "string"} for stage in COMPILED_STAGES},
+        "required": list(COMPILED_STAGES),
+        "additionalProperties": False,
+    },
+}
+
+
+def _compiled_prompt() -> str:
+    """Join every stage's system prompt, delimited by the output field it fills."""
+    sections = [
+        "You run an entire research workflow in one response. Work through the "
+        "stages below in order, each building on the previous ones, and return "
+        "every stage's output in the matching JSON field."
+    ]
+    for stage, key in COMPILED_STAGES.items():
+        tag = stage.upper()
+        sections.append(f"<<<{tag}>>>\n{AGENT_SPECS[key].system_prompt}\n<<</{tag}>>>")
+    return "\n\n".join(sections)
+
+
+# Built once so every call sends the identical, cacheable prompt prefix
+COMPILED_SYSTEM_PROMPT: Final[str] = sys.intern(_compiled_prompt())
+
+
+class CompiledOutputError(ValueError):
+    """Raised when the compiled call does not return every stage's output."""
+
+
+def requires_web_search(topic: str) -> bool:
+    """Return True if ``topic`` asks about recent events that need live search results."""
+    return _WEB_SEARCH_RE.search(topic) is not None
+
+
+def should_compile(topic: str) -> bool:
+    """Return True if ``topic`` is short and answerable without web search."""
+    return len(topic) < COMPILED_MAX_TOPIC_CHARS and not requires_web_search(topic)
+
+
+async def run_compiled(topic: str, api_key: str, config_path: str) -> Dict[str, str]:
+    """
+    Run planning through summary for ``topic`` with a single LLM call.
+
+    Args:
+        topic: Research topic
+        api_key: OpenAI API key
+        config_path: Path to the configuration file
+
+    Returns:
+        Dictionary mapping each name in ``COMPILED_STAGES`` to that stage's output
+
+    Raises:
+        CompiledOutputError: If the response is not JSON with a string for every stage
+    """
+    from llama_index.core.llms import ChatMessage
+
+    llm = _llm_server(api_key, config_path, "full")
+    response = await llm.achat(
+        [
+            ChatMessage(role="system", content=COMPILED_SYSTEM_PROMPT),
+            ChatMessage(role="user", content=f"Research topic: {topic}"),
+        ],
+        response_format={"type": "json_schema", "json_schema": WORKFLOW_SCHEMA},
+    )
+    try:
+        stages = json.loads(response.message.content)
+    except (ValueError, TypeError) as e:
+        raise CompiledOutputError(f"Compiled workflow returned invalid JSON: {e}") from e
+    if not isinstance(stages, dict):
+        raise CompiledOutputError("Compiled workflow did not return a JSON object")
+    missing = [stage for stage in COMPILED_STAGES if not isinstance(stages.get(stage), str)]
+    if missing:
+        raise CompiledOutputError(f"Compiled workflow is missing stages: {missing}")
+    return stages
@@ -1,157 +1,42 @@
-from typing import List, Optional
-from models.agent import Agent
+from functools import partial
 
-class FactCheckingAgent(Agent):
-    name: str = "FactCheckingAgent"
-    description: str = "Useful for verifying the factual accuracy of reports."
-    system_prompt = (
-        "You are FactCheckingAgent, an autonomous agent specializing in verifying the factual accuracy of reports. "
-        "Your task is to systematically review the report, checking all important claims, data points, and references for accuracy using reliable sources. "
-        "If you find any inaccuracies or unsupported statements, note them clearly and suggest corrections or clarifications. "
-        "Summarize your fact-checking process and provide a brief list of verified facts, corrected errors, and any statements that require further evidence. "
-        "When you have completed your fact-checking, your task is finished."
-    )
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+from agents.registry import AGENT_SPECS, RegisteredAgent, agent, build
 
-class FormattingAgent(Agent):
-    name: str = "FormattingAgent"
-    description: str = "Useful for formatting reports according to specified guidelines."
-    system_prompt = (
-        "You are FormattingAgent, an autonomous agent specializing in formatting reports according to specified guidelines. "
-        "Your task is to ensure the report is well-formatted and consistent, including headings, section breaks, bullet points, numbering, and citation style as required. "
-        "Improve the visual organization, readability, and professionalism of the document, making sure it meets the specified formatting standards. "
-        "Do not alter the content unless necessary for formatting. "
-        "When formatting is complete, your task is finished."
-    )
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
 
-class PlanningAgent(Agent):
-    name: str = "PlanningAgent"
-    description: str = "Useful for creating a research plan"
-    system_prompt: str = """
-        Create a detailed, step-by-step plan to thoroughly research and analyze the topic of [INSERT TOPIC HERE].
-        The plan should include:
-        Steps for identifying key areas of focus and the most relevant aspects of the topic.
-        How to search for and collect important sources of information (such as research papers, reports, news articles, or data).
-            Actions for summarizing and organizing key findings, including comparisons where relevant.
-            Guidance on identifying leading experts, organizations, or companies involved in the area.
-            Suggestions for benchmarking, best practices, and identifying open questions or challenges.
-            Consider additional angles such as historical context, current trends, future directions.
-            Consider the positive and negative aspects of the topic, including potential benefits, risks, and ethical considerations.
-            Structure the plan as a numbered list of steps, with each step briefly explaining what should be done and what information should be gathered at that stage.
-            Example:
-                (1) Analyze current research and real-world applications related to [TOPIC], focusing on the latest developments in the field.
-                (2) Search for recent academic publications, preprints, industry reports, or technical documentation pertaining to [TOPIC].
-                (3) For the approaches, methods, or technologies identified in the initial analysis, conduct targeted literature and patent searches to find advanced, state-of-the-art techniques and notable use-cases, especially those with strong experimental or practical validation.
-                (4) For each significant method, case study, or solution found, gather and synthesize the following information:
-                (a) The title and a summary of the key methodology or approach.
-                (b) The data sources, features, or tools used (customize this point to fit the topic: e.g., datasets, instruments, frameworks).
-                (c) Performance metrics or evaluation criteria reported (customize this to suit the field: e.g., accuracy, speed, ROI) and how these compare with alternative approaches.
-                (d) Notable challenges, limitations, or open questions highlighted by the authors or practitioners.
-                (5) Identify major research groups, organizations, companies, or consortia working on [TOPIC], and review their recent projects, publications, and any available opportunities for collaboration or partnership.
-                (6) Review benchmarking studies, comparative analyses, and open datasets or tools relevant to [TOPIC], summarizing best practices for evaluation and comparing results across different approaches or solutions.
-            Do not simply copy the structure of the example above; instead, adapt your plan thoughtfully based on the unique characteristics of the topic. Consider other relevant angles, questions, or lines of inquiry that would help achieve a comprehensive understanding, even if they are not explicitly included in the sample steps.
-            """
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] | None = None
-    can_handoff_to: Optional[List[str]] | None = None
+@agent("factchecking")
+class FactCheckingAgent(RegisteredAgent):
+    __slots__ = ()
 
-class ResearchAgent(Agent):
-    name: str = "ResearchAgent"
-    description: str = "Useful for searching the web for information on a given topic and recording notes on the topic."
-    system_prompt: str = """
-        You are ResearchAgent, an autonomous agent specializing in researching a given topic by searching the web and recording detailed, organized notes.
-        You will be provided with a plan or a set of research questions and tasks. Use these as a guide, but always consider what additional information, angles, or context may be important to truly understand the topic.
-        Do not simply follow instructions mechanically—adapt and expand on them if it leads to deeper insight or a more thorough set of notes.
-        For each step or question, conduct research using reliable sources. Summarize and synthesize your findings in clear, well-structured notes, including all relevant facts, explanations, and evidence.
-        If you encounter conflicting information or open questions, make a note of them.
-        Continue your research until you are satisfied that you have thoroughly covered the topic as outlined in the plan, as well as any other important related aspects.
-        When your notes are complete and comprehensive, hand off control to the WriteAgent to draft a report based on your findings.
-    """
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+@agent("formatting")
+class FormattingAgent(RegisteredAgent):
+    __slots__ = ()
 
-class ReviewAgent(Agent):
-    name: str = "ReviewAgent"
-    description: str = "Useful for reviewing the report written by the WriteAgent and providing feedback."
-    system_prompt = """
-        "You are ReviewAgent, an autonomous agent specializing in critically reviewing reports written by the WriteAgent. "
-        "Your role is to carefully read the report and provide clear, constructive feedback and suggestions for improvement. "
-        "Assess the report for accuracy, completeness, clarity, structure, and coherence. "
-        "Specifically, consider: "
-        "- Does the report address all relevant research findings and questions? "
-        "- Is the information presented in a clear, logical, and well-organized manner? "
-        "- Are there any gaps, ambiguities, or areas needing further explanation or evidence? "
-        "- Is the writing style appropriate for the intended audience? "
-        "- Are there opportunities to improve readability, flow, or formatting? "
-        "Provide actionable, specific suggestions for improvement where needed, and highlight strengths as well as weaknesses. "
-        "If the report is already strong, confirm this and suggest any minor refinements if applicable. "
-        "When your review is complete, your task is finished."
-    """
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+@agent("planning")
+class PlanningAgent(RegisteredAgent):
+    __slots__ = ()
 
-class RevisionAgent(Agent):
-    name: str = "RevisionAgent"
-    description: str = "Useful for revising reports based on feedback from the ReviewAgent."
-    system_prompt = (
-        "You are RevisionAgent, an autonomous agent specializing in revising reports based on feedback from the ReviewAgent. "
-        "Your task is to carefully read the reviewers feedback and suggestions, then make appropriate improvements to the report. "
-        "Revise sections for clarity, completeness, accuracy, and flow. "
-        "Ensure that all actionable feedback is addressed. "
-        "Maintain the reports original intent and structure, but improve the writing wherever possible. "
-        "When your revisions are complete, your task is finished."
-    )
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+@agent("research")
+class ResearchAgent(RegisteredAgent):
+    __slots__ = ()
 
-class SummaryAgent(Agent):
-    name: str = "SummaryAgent"
-    description: str = "Useful for creating concise and accurate summaries of reports."
-    system_prompt = (
-        "You are SummaryAgent, an autonomous agent specializing in creating concise and accurate summaries of reports. "
-        "Your task is to read the full report and produce a clear, informative summary that captures the main findings, conclusions, and recommendations. "
-        "Write the summary in accessible language appropriate for the intended audience, highlighting only the most important points and omitting minor details. "
-        "Ensure the summary is standalone and understandable without reference to the full report. "
-        "When your summary is complete, your task is finished."
-    )
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+@agent("review")
+class ReviewAgent(RegisteredAgent):
+    __slots__ = ()
 
-class WriteAgent(Agent):
-    name: str = "WriteAgent"
-    description: str = "Useful for writing a report based on the research conducted by the ResearchAgent."
-    system_prompt = (
-        "You are WriteAgent, an autonomous agent specializing in writing comprehensive reports based on research notes provided by the ResearchAgent. "
-        "Your task is to synthesize and organize the research findings into a well-structured, detailed report. The report should be logically organized, using clear headings and sections where appropriate. "
-        "Present the information in a way that is clear, accurate, and easy to follow, ensuring all key insights, evidence, and context from the research are included. "
-        "If the research notes contain open questions, uncertainties, or conflicting findings, address these transparently in the report. "
-        "Write in original prose; do not copy the research notes verbatim. Ensure the report flows smoothly, with appropriate transitions and explanations. "
-        "Use a tone and level of detail suitable for the intended audience, and format the report for readability. "
-        "When you have completed the report, your task is finished."
-    )
-    llm: str = "gpt-4.1-mini"
-    tools: Optional[List[str]] = None
-    can_handoff_to: Optional[List[str]] = None
+@agent("revision")
+class RevisionAgent(RegisteredAgent):
+    __slots__ = ()
 
-AGENTS = {
-    "planning": PlanningAgent,
-    "research": ResearchAgent,
-    "write": WriteAgent,
-    "review": ReviewAgent,
-    "revision": RevisionAgent,
-    "formatting": FormattingAgent,
-    "summary": SummaryAgent,
-    "factchecking": FactCheckingAgent,
-}
+@agent("summary")
+class SummaryAgent(RegisteredAgent):
+    __slots__ = ()
+
+@agent("write")
+class WriteAgent(RegisteredAgent):
+    __slots__ = ()
+
+# Factories returning a built agent whose run() is cached: AGENTS[key](api_key, config_path)
+AGENTS = {key: partial(build, spec) for key, spec in AGENT_SPECS.items()}
 
 # Workflow order for reference
 WORKFLOW_ORDER = [
@@ -162,4 +47,18 @@ WORKFLOW_ORDER = [
     "revision",
     "formatting",
     "summary"
-]
\ No newline at end of file
+]
+
+# Stage dependencies driving DeepResearchWorkflow.execute via agents.scheduler.run_dag.
+# "revision" is the review/revision loop, which alternates ReviewAgent and
+# RevisionAgent until the report is approved; fact-checking and formatting
+# both only need its result, so they run concurrently.
+WORKFLOW_DAG = {
+    "planning": (),
+    "research": ("planning",),
+    "write": ("research",),
+    "revision": ("write",),
+    "factchecking": ("revision",),
+    "formatting": ("revision",),
+    "summary": ("formatting",),
+}
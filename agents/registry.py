@@ -0,0 +1,204 @@
+"""Data-driven registry of the research workflow agents.
+
+Each agent is described once by an :class:`AgentSpec`; the agent classes in
+``agents.deep_agents`` and the ``AGENTS`` factories are derived from this table.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+
+from agents.batcher import BATCHED_AGENTS, BatchedAgent
+from agents.cache import CachedAgent
+from agents.prompts import (
+    FACT_CHECKING_PROMPT,
+    FORMATTING_PROMPT,
+    PLANNING_PROMPT,
+    RESEARCH_PROMPT,
+    REVIEW_PROMPT,
+    REVISION_PROMPT,
+    SUMMARY_PROMPT,
+    WRITE_PROMPT,
+    get_planning_template,
+)
+from models.agent import Agent, LlmTier
+from utils.config import load_config
+
+if TYPE_CHECKING:
+    from llama_index.core.agent.workflow import FunctionAgent
+
+
+# Function tools agents may list by name in AgentSpec.tools
+AGENT_TOOLS: Dict[str, Callable[..., Any]] = {
+    "get_planning_template": get_planning_template,
+}
+
+
+class RegisteredAgent(Agent):
+    """Agent whose tool names resolve against ``AGENT_TOOLS``."""
+
+    __slots__ = ()
+
+    def _resolve_tools(self, tool_names: List[str]) -> List[Callable[..., Any]]:
+        return [AGENT_TOOLS[name] for name in tool_names if name in AGENT_TOOLS]
+
+
+@dataclass(frozen=True, slots=True)
+class AgentSpec:
+    """Static configuration for a single agent."""
+
+    name: str
+    description: str
+    system_prompt: str
+    llm: str
+    tools: tuple[str, ...] = ()
+    can_handoff_to: frozenset[str] = frozenset()
+    llm_tier: Optional[LlmTier] = None
+
+    def agent_kwargs(self) -> Dict[str, Any]:
+        """Return the keyword arguments expected by :class:`RegisteredAgent`."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "system_prompt": self.system_prompt,
+            "llm": self.llm,
+            "tools": self.tools,
+            "can_handoff_to": self.can_handoff_to,
+            "llm_tier": self.llm_tier,
+        }
+
+
+AGENT_SPECS: Dict[str, AgentSpec] = {
+    "planning": AgentSpec(
+        name="PlanningAgent",
+        description="Useful for creating a research plan",
+        system_prompt=PLANNING_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+        tools=("get_planning_template",),
+    ),
+    "research": AgentSpec(
+        name="ResearchAgent",
+        description="Useful for searching the web for information on a given topic and recording notes on the topic.",
+        system_prompt=RESEARCH_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+    ),
+    "write": AgentSpec(
+        name="WriteAgent",
+        description="Useful for writing a report based on the research conducted by the ResearchAgent.",
+        system_prompt=WRITE_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+    ),
+    "review": AgentSpec(
+        name="ReviewAgent",
+        description="Useful for reviewing the report written by the WriteAgent and providing feedback.",
+        system_prompt=REVIEW_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+    ),
+    "revision": AgentSpec(
+        name="RevisionAgent",
+        description="Useful for revising reports based on feedback from the ReviewAgent.",
+        system_prompt=REVISION_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+    ),
+    "formatting": AgentSpec(
+        name="FormattingAgent",
+        description="Useful for formatting reports according to specified guidelines.",
+        system_prompt=FORMATTING_PROMPT,
+        llm="gpt-4.1-nano",
+        llm_tier="nano",
+    ),
+    "summary": AgentSpec(
+        name="SummaryAgent",
+        description="Useful for creating concise and accurate summaries of reports.",
+        system_prompt=SUMMARY_PROMPT,
+        llm="gpt-4.1-nano",
+        llm_tier="nano",
+    ),
+    "factchecking": AgentSpec(
+        name="FactCheckingAgent",
+        description="Useful for verifying the factual accuracy of reports.",
+        system_prompt=FACT_CHECKING_PROMPT,
+        llm="gpt-4.1-mini",
+        llm_tier="mini",
+    ),
+}
+
+
+# Wrapped agents keyed by id() of the FunctionAgent they wrap; build_agent keeps
+# every FunctionAgent alive in its own cache, so the ids are never reused
+_WRAPPED: Dict[int, Any] = {}
+
+
+def _wrap(spec: AgentSpec, agent: "FunctionAgent", config_path: str) -> Any:
+    """Wrap a built agent so its ``run`` goes through the response caches.
+
+    Every agent serves repeated deterministic prompts from disk, and agents
+    in ``BATCHED_AGENTS`` share one LLM call with concurrent requests.
+    """
+    # The same temperature _llm_server gives the agent's client, so the key
+    # describes the real sampling settings
+    wrapped: Any = CachedAgent(agent, load_config(config_path).temperature, spec.tools)
+    if spec.name in BATCHED_AGENTS:
+        wrapped = BatchedAgent(wrapped)
+    return wrapped
+
+
+def build(spec: AgentSpec, api_key: str, config_path: str) -> Any:
+    """Build the agent described by ``spec``.
+
+    The FunctionAgent is wrapped so ``run(user_msg)`` returns the response
+    text through the response caches; other attributes pass through to it.
+    Repeated calls with the same spec, API key and config path return the
+    same wrapper around the agent cached by
+    :meth:`models.agent.Agent.build_agent`.
+    """
+    agent = RegisteredAgent(**spec.agent_kwargs()).build_agent(
+        api_key=api_key, config_path=config_path
+    )
+    wrapped = _WRAPPED.get(id(agent))
+    if wrapped is None:
+        wrapped = _WRAPPED[id(agent)] = _wrap(spec, agent, config_path)
+    return wrapped
+
+
+async def build_agents(
+    agents: Iterable[Agent], api_key: str, config_path: str
+) -> List["FunctionAgent"]:
+    """Build several agents concurrently, overlapping their config reads and client setup.
+
+    Results are returned in the same order as ``agents``.
+    """
+    return list(
+        await asyncio.gather(
+            *(asyncio.to_thread(a.build_agent, api_key, config_path) for a in agents)
+        )
+    )
+
+
+_A = TypeVar("_A", bound=RegisteredAgent)
+
+
+def _init_from_spec(self: RegisteredAgent) -> None:
+    """Shared ``__init__`` for agent classes declared with :func:`agent`."""
+    RegisteredAgent.__init__(self, **type(self).spec.agent_kwargs())
+
+
+def agent(key: str) -> Callable[[Type[_A]], Type[_A]]:
+    """Class decorator populating an agent class from ``AGENT_SPECS[key]``.
+
+    The decorated class gets a ``spec`` attribute and a no-argument
+    ``__init__`` shared by every declared agent.
+    """
+    spec = AGENT_SPECS[key]
+
+    def wrap(cls: Type[_A]) -> Type[_A]:
+        cls.spec = spec
+        cls.__init__ = _init_from_spec
+        return cls
+
+    return wrap
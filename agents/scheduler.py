@@ -0,0 +1,67 @@
+"""Dependency-driven scheduling of workflow stages."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Tuple
+
+StageRunner = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def _topological_order(dag: Mapping[str, Tuple[str, ...]]) -> List[str]:
+    """Return the stages of ``dag`` so every stage follows its dependencies."""
+    for stage, deps in dag.items():
+        unknown = [dep for dep in deps if dep not in dag]
+        if unknown:
+            raise ValueError(f"Stage {stage!r} depends on unknown stages: {unknown}")
+
+    order: List[str] = []
+    done = set()
+    while len(order) < len(dag):
+        ready = [
+            stage
+            for stage in dag
+            if stage not in done and all(dep in done for dep in dag[stage])
+        ]
+        if not ready:
+            raise ValueError(f"Workflow graph has a cycle among: {sorted(set(dag) - done)}")
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+async def run_dag(
+    dag: Mapping[str, Tuple[str, ...]],
+    run: StageRunner,
+) -> Dict[str, Any]:
+    """
+    Run every stage of a dependency graph, overlapping independent stages.
+
+    Each stage starts as soon as its own dependencies have completed, so
+    stages that only share an upstream dependency run concurrently.
+
+    Args:
+        dag: Mapping of stage name to the names of the stages it depends on
+        run: Async callable receiving the stage name and its dependencies' results
+
+    Returns:
+        Dictionary mapping each stage name to its result
+
+    Raises:
+        ValueError: If a dependency is unknown or the graph contains a cycle
+    """
+    order = _topological_order(dag)
+    tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def run_stage(stage: str) -> Any:
+        inputs = {dep: await tasks[dep] for dep in dag[stage]}
+        return await run(stage, inputs)
+
+    for stage in order:
+        tasks[stage] = asyncio.create_task(run_stage(stage))
+
+    try:
+        outputs = await asyncio.gather(*(tasks[stage] for stage in order))
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return dict(zip(order, outputs))
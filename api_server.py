@@ -9,16 +9,20 @@ Provides REST API endpoints for:
 """
 
 import asyncio
+import os
 import uuid
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Tuple
+from datetime import datetime, timezone
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from anthropic import AsyncAnthropic
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel, Field
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 
 from deepresearch import DeepResearchWorkflow, WorkflowState
 from database import get_database
+from utils.config import load_config
+from utils.http import aclose_shared_async_client
 
 # Initialize app
 app = FastAPI(
@@ -30,6 +34,10 @@ app = FastAPI(
 # Database
 db = get_database()
 
+# Workflows running at once, and submissions allowed to wait for a worker
+WORKFLOW_CONCURRENCY = int(os.getenv("WORKFLOW_CONCURRENCY", 4))
+WORKFLOW_QUEUE_SIZE = int(os.getenv("WORKFLOW_QUEUE_SIZE", 100))
+
 
 # Request/Response models
 
@@ -43,6 +51,14 @@ class WorkflowRequest(BaseModel):
     )
 
 
+class WorkflowBatchRequest(BaseModel):
+    """Request to start several research workflows at once."""
+
+    workflows: List[WorkflowRequest] = Field(
+        ..., description="Workflows to start", min_length=1, max_length=100
+    )
+
+
 class WorkflowResponse(BaseModel):
     """Response after workflow submission."""
 
@@ -94,20 +110,25 @@ class HealthResponse(BaseModel):
     timestamp: datetime
 
 
+def _from_epoch_us(value: Optional[int]) -> Optional[datetime]:
+    """Convert a stored epoch-microsecond timestamp to a UTC datetime."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1_000_000, tz=timezone.utc)
+
+
 # Background tasks
 
 
-def execute_workflow_background(workflow_id: str, topic: str):
+async def execute_workflow_background(workflow_id: str, topic: str):
     """Execute workflow in background."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         workflow = DeepResearchWorkflow()
-        result = loop.run_until_complete(workflow.execute(topic))
+        result = await workflow.execute(topic)
 
         # Update database with results
-        db.update_workflow(
+        await asyncio.to_thread(
+            db.update_workflow,
             workflow_id,
             status="completed",
             final_report=result.get("summary", ""),
@@ -116,13 +137,24 @@ def execute_workflow_background(workflow_id: str, topic: str):
 
     except Exception as e:
         # Record error in database
-        db.update_workflow(
+        await asyncio.to_thread(
+            db.update_workflow,
             workflow_id,
             status="failed",
             error_message=str(e),
         )
 
 
+async def workflow_worker(queue: "asyncio.Queue[Tuple[str, str]]"):
+    """Run queued workflows one at a time until cancelled."""
+    while True:
+        workflow_id, topic = await queue.get()
+        try:
+            await execute_workflow_background(workflow_id, topic)
+        finally:
+            queue.task_done()
+
+
 # Routes
 
 
@@ -149,36 +181,45 @@ async def health():
     summary="Submit a research workflow",
     description="Start a new research workflow with the given topic",
 )
-async def submit_workflow(
-    request: WorkflowRequest,
-    background_tasks: BackgroundTasks,
-):
+async def submit_workflow(request: WorkflowRequest):
     """
     Submit a new research workflow.
 
     Args:
         request: WorkflowRequest with topic and optional config path
-        background_tasks: Background task manager
 
     Returns:
         WorkflowResponse with workflow_id and status
+
+    Raises:
+        HTTPException: If the workflow queue is full
     """
+    queue = app.state.workflow_queue
+    if queue.full():
+        raise HTTPException(status_code=503, detail="Workflow queue is full, retry later")
+
     # Generate unique workflow ID
     workflow_id = str(uuid.uuid4())
 
     # Save to database
-    db.save_workflow(
+    await asyncio.to_thread(
+        db.save_workflow,
         workflow_id=workflow_id,
         user_prompt=request.topic,
         status="submitted",
     )
 
-    # Schedule background execution
-    background_tasks.add_task(
-        execute_workflow_background,
-        workflow_id,
-        request.topic,
-    )
+    # Queue for the worker pool; the queue may have filled while saving
+    try:
+        queue.put_nowait((workflow_id, request.topic))
+    except asyncio.QueueFull:
+        await asyncio.to_thread(
+            db.update_workflow,
+            workflow_id,
+            status="failed",
+            error_message="Workflow queue is full",
+        )
+        raise HTTPException(status_code=503, detail="Workflow queue is full, retry later")
 
     return WorkflowResponse(
         workflow_id=workflow_id,
@@ -187,6 +228,57 @@ async def submit_workflow(
     )
 
 
+@app.post(
+    "/workflows/batch",
+    response_model=List[WorkflowResponse],
+    tags=["Workflows"],
+    summary="Submit several research workflows",
+    description="Start up to 100 research workflows in one request",
+)
+async def submit_workflows_batch(request: WorkflowBatchRequest):
+    """
+    Submit several research workflows.
+
+    All workflows are saved with one bulk insert. Any that no longer fit in
+    the queue by the time they are enqueued are returned with status "failed".
+
+    Args:
+        request: WorkflowBatchRequest with the workflows to start
+
+    Returns:
+        A WorkflowResponse per submitted workflow, in request order
+
+    Raises:
+        HTTPException: If the queue cannot take the whole batch
+    """
+    queue = app.state.workflow_queue
+    if queue.maxsize - queue.qsize() < len(request.workflows):
+        raise HTTPException(status_code=503, detail="Workflow queue is full, retry later")
+
+    rows = [(str(uuid.uuid4()), item.topic) for item in request.workflows]
+    await asyncio.to_thread(db.save_workflows_bulk, rows, "submitted")
+
+    created_at = datetime.now()
+    responses = []
+    for workflow_id, topic in rows:
+        try:
+            queue.put_nowait((workflow_id, topic))
+            status = "submitted"
+        except asyncio.QueueFull:
+            await asyncio.to_thread(
+                db.update_workflow,
+                workflow_id,
+                status="failed",
+                error_message="Workflow queue is full",
+            )
+            status = "failed"
+        responses.append(
+            WorkflowResponse(workflow_id=workflow_id, status=status, created_at=created_at)
+        )
+
+    return responses
+
+
 @app.get(
     "/workflows/{workflow_id}",
     response_model=WorkflowStatus,
@@ -207,7 +299,7 @@ async def get_workflow_status(workflow_id: str):
     Raises:
         HTTPException: If workflow not found
     """
-    workflow = db.get_workflow(workflow_id)
+    workflow = await asyncio.to_thread(db.get_workflow, workflow_id)
 
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
@@ -216,12 +308,8 @@ async def get_workflow_status(workflow_id: str):
         workflow_id=workflow["workflow_id"],
         status=workflow["status"],
         user_prompt=workflow["user_prompt"],
-        created_at=datetime.fromisoformat(workflow["created_at"]),
-        completed_at=(
-            datetime.fromisoformat(workflow["completed_at"])
-            if workflow["completed_at"]
-            else None
-        ),
+        created_at=_from_epoch_us(workflow["created_at_us"]),
+        completed_at=_from_epoch_us(workflow["completed_at_us"]),
         output_path=workflow["output_path"],
         error_message=workflow["error_message"],
     )
@@ -247,7 +335,7 @@ async def get_workflow_result(workflow_id: str):
     Raises:
         HTTPException: If workflow not found or not completed
     """
-    workflow = db.get_workflow(workflow_id)
+    workflow = await asyncio.to_thread(db.get_workflow, workflow_id, include_reports=True)
 
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
@@ -276,20 +364,24 @@ async def get_workflow_result(workflow_id: str):
     summary="Download report",
     description="Download the generated report file",
 )
-async def download_report(workflow_id: str):
+async def download_report(workflow_id: str, request: Request):
     """
     Download generated report.
 
+    The response carries an ETag built from the file's mtime and size, so
+    clients revalidating with If-None-Match get 304 Not Modified.
+
     Args:
         workflow_id: Workflow identifier
+        request: Incoming request, checked for If-None-Match
 
     Returns:
-        Report file
+        Report file, or an empty 304 response if the client's copy is current
 
     Raises:
         HTTPException: If workflow not found or no report available
     """
-    workflow = db.get_workflow(workflow_id)
+    workflow = await asyncio.to_thread(db.get_workflow, workflow_id)
 
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
@@ -300,9 +392,20 @@ async def download_report(workflow_id: str):
             detail="No report available for this workflow",
         )
 
+    try:
+        stat = await asyncio.to_thread(os.stat, workflow["output_path"])
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Report file not found")
+
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+
     return FileResponse(
         path=workflow["output_path"],
         filename=f"report_{workflow_id}.html",
+        stat_result=stat,
+        headers={"ETag": etag},
     )
 
 
@@ -326,12 +429,12 @@ async def get_workflow_statistics(workflow_id: str):
     Raises:
         HTTPException: If workflow not found
     """
-    workflow = db.get_workflow(workflow_id)
+    workflow = await asyncio.to_thread(db.get_workflow, workflow_id)
 
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    stats = db.get_statistics(workflow_id)
+    stats = await asyncio.to_thread(db.get_statistics, workflow_id)
 
     return WorkflowStatistics(
         workflow_id=workflow_id,
@@ -355,11 +458,11 @@ async def list_workflows():
     Returns:
         List of workflows with basic information
     """
-    workflows = db.get_workflow_history()
+    workflows = await asyncio.to_thread(db.get_workflow_history)
 
     return {
         "count": len(workflows),
-        "workflows": workflows,
+        "workflows": [workflow._asdict() for workflow in workflows],
     }
 
 
@@ -373,6 +476,9 @@ async def delete_workflow(workflow_id: str):
     """
     Delete workflow.
 
+    The workflow is soft-deleted: it is kept in the database but no longer
+    returned by any endpoint.
+
     Args:
         workflow_id: Workflow identifier
 
@@ -382,15 +488,13 @@ async def delete_workflow(workflow_id: str):
     Raises:
         HTTPException: If workflow not found
     """
-    workflow = db.get_workflow(workflow_id)
+    deleted = await asyncio.to_thread(db.soft_delete, workflow_id)
 
-    if not workflow:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    # In a production system, you'd delete from database
-    # For now, just return confirmation
     return {
-        "message": f"Workflow {workflow_id} marked for deletion",
+        "message": f"Workflow {workflow_id} deleted",
         "workflow_id": workflow_id,
     }
 
@@ -398,24 +502,50 @@ async def delete_workflow(workflow_id: str):
 # Error handlers
 
 
-@app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
     """Handle ValueError exceptions."""
-    return HTTPException(status_code=400, detail=str(exc))
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
-@app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
-    return HTTPException(status_code=500, detail="Internal server error")
+    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
+app.add_exception_handler(ValueError, value_error_handler)
+app.add_exception_handler(Exception, general_exception_handler)
 
 
 # Startup/Shutdown events
 
 
+def _warm_workflow():
+    """Load what every DeepResearchWorkflow needs so the first workflow doesn't pay for it."""
+    # Parses and caches the config each workflow loads
+    load_config(".config/config.yaml")
+    # Creating a client and touching its messages resource loads the SSL
+    # context and the lazily imported Anthropic resource modules
+    AsyncAnthropic().messages
+
+
+async def warm_workflow():
+    """Warm the config and Anthropic client used by every workflow."""
+    try:
+        await asyncio.to_thread(_warm_workflow)
+    except Exception as e:
+        # Warm-up is an optimisation; workflows load what they need on demand
+        print(f"Workflow warm-up skipped: {e}")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on server startup."""
+    app.state.workflow_queue = asyncio.Queue(maxsize=WORKFLOW_QUEUE_SIZE)
+    app.state.workflow_workers = [
+        asyncio.create_task(workflow_worker(app.state.workflow_queue))
+        for _ in range(WORKFLOW_CONCURRENCY)
+    ]
+    await warm_workflow()
     print("Deep Research Workflow API started")
     print("API Documentation: http://localhost:8000/docs")
 
@@ -423,6 +553,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on server shutdown."""
+    for worker in app.state.workflow_workers:
+        worker.cancel()
+    await asyncio.gather(*app.state.workflow_workers, return_exceptions=True)
+    await aclose_shared_async_client()
     db.close()
     print("Deep Research Workflow API stopped")
 
@@ -8,41 +8,390 @@ Provides SQLite-based persistence for:
 - User approvals and feedback
 """
 
-import sqlite3
+import contextlib
+import concurrent.futures
+import itertools
 import json
+import queue
+import threading
+import time
+import zlib
+from collections import namedtuple
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Union
 import logging
 
+# pysqlite3-binary bundles a current SQLite build and is a drop-in replacement
+# for the stdlib module; use it when installed
+try:
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
+
 logger = logging.getLogger("database")
 
+# Stored in PRAGMA user_version once the schema is in place; bump when tables change
+_SCHEMA_VERSION = 1
+
+# Background writer: most queued writes committed together, and how long to wait for more
+_WRITE_BATCH_SIZE = 100
+_WRITE_WINDOW_S = 0.01
+
+# Rows fetched per round trip when streaming large result sets
+_FETCH_SIZE = 200
+
+# Report-sized workflow fields are stored zlib-compressed once they reach this size
+_COMPRESSED_FIELDS = ("research_plan", "draft_report", "final_report", "summary")
+_COMPRESS_MIN_BYTES = 1024
+
+# Statements run on every call. Reusing the same text lets the connection's
+# statement cache skip parsing and compiling them after the first call.
+_STATEMENT_CACHE_SIZE = 256
+
+# Fixed text for every combination of fields; NULL parameters leave columns unchanged
+_SQL_WORKFLOW_ASSIGNMENTS = """
+    status = COALESCE(:status, status),
+    research_plan = COALESCE(:research_plan, research_plan),
+    draft_report = COALESCE(:draft_report, draft_report),
+    final_report = COALESCE(:final_report, final_report),
+    summary = COALESCE(:summary, summary),
+    output_path = COALESCE(:output_path, output_path),
+    error_message = COALESCE(:error_message, error_message),
+    completed_at = CASE WHEN :status = 'completed' THEN CURRENT_TIMESTAMP ELSE completed_at END,
+    completed_at_us = CASE WHEN :status = 'completed' THEN :now_us ELSE completed_at_us END
+"""
+_SQL_UPSERT_WORKFLOW = f"""
+INSERT INTO workflows (
+    workflow_id, user_prompt, status, research_plan, draft_report, final_report,
+    summary, output_path, error_message, created_at_us, completed_at, completed_at_us
+)
+VALUES (
+    -- NOT NULL is checked before the conflict, so reuse the stored prompt on updates
+    :workflow_id,
+    COALESCE(:user_prompt, (SELECT user_prompt FROM workflows WHERE workflow_id = :workflow_id)),
+    COALESCE(:status, 'in_progress'), :research_plan,
+    :draft_report, :final_report, :summary, :output_path, :error_message, :now_us,
+    CASE WHEN :status = 'completed' THEN CURRENT_TIMESTAMP END,
+    CASE WHEN :status = 'completed' THEN :now_us END
+)
+ON CONFLICT(workflow_id) DO UPDATE SET
+    user_prompt = COALESCE(:user_prompt, user_prompt),{_SQL_WORKFLOW_ASSIGNMENTS}"""
+# Lookups skip the report fields unless asked, so SQLite never decodes them
+_WORKFLOW_COLUMNS = """
+workflow_id, user_prompt, created_at, completed_at, status, output_path,
+error_message, created_at_us, completed_at_us
+"""
+_WORKFLOW_COLUMNS_FULL = _WORKFLOW_COLUMNS + ", " + ", ".join(_COMPRESSED_FIELDS)
+_SQL_GET_WORKFLOW = f"""
+SELECT {_WORKFLOW_COLUMNS} FROM workflows WHERE workflow_id = ? AND deleted_at IS NULL
+"""
+_SQL_GET_WORKFLOW_FULL = f"""
+SELECT {_WORKFLOW_COLUMNS_FULL} FROM workflows WHERE workflow_id = ? AND deleted_at IS NULL
+"""
+_SQL_SOFT_DELETE = """
+UPDATE workflows SET deleted_at = CURRENT_TIMESTAMP
+WHERE workflow_id = ? AND deleted_at IS NULL
+"""
+_SQL_INSERT_NOTE = """
+INSERT INTO research_notes
+(workflow_id, note_content, source_url, source_title, category)
+VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_GET_NOTES = "SELECT * FROM research_notes WHERE workflow_id = ? ORDER BY created_at"
+_SQL_INSERT_ITERATION = """
+INSERT INTO iterations
+(workflow_id, iteration_number, stage, input_content, output_content, feedback)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_APPROVAL = """
+INSERT INTO approvals
+(workflow_id, approval_type, content, approved, notes)
+VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_SEARCH = """
+INSERT INTO search_history
+(workflow_id, search_type, query, results_count)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_WORKFLOW_HISTORY = """
+SELECT workflow_id, user_prompt, created_at, status, output_path
+FROM workflows
+WHERE deleted_at IS NULL
+ORDER BY created_at DESC
+"""
+_SQL_STATISTICS = """
+SELECT
+    (SELECT COUNT(*) FROM iterations WHERE workflow_id = ?) AS iterations,
+    (SELECT COUNT(*) FROM research_notes WHERE workflow_id = ?) AS notes,
+    (SELECT COUNT(*) FROM search_history WHERE workflow_id = ?) AS searches,
+    (SELECT COUNT(*) FROM approvals WHERE workflow_id = ?) AS approvals
+"""
+
+
+@lru_cache(maxsize=32)
+def _row_type(columns: Tuple[str, ...]) -> type:
+    """Return the namedtuple class for a result set with the given columns."""
+    return namedtuple("Row", columns)
+
+
+def _columns(cursor: sqlite3.Cursor) -> Tuple[str, ...]:
+    """Column names of the cursor's current result set."""
+    return tuple(description[0] for description in cursor.description)
+
+
+def _compress(text: Optional[str]) -> Optional[Any]:
+    """Return ``text`` as a compressed BLOB if it is large enough to benefit."""
+    if text is None:
+        return None
+    data = text.encode("utf-8")
+    if len(data) < _COMPRESS_MIN_BYTES:
+        return text
+    return zlib.compress(data)
+
+
+def _decompress(value: Optional[Any]) -> Optional[str]:
+    """Inverse of _compress; values stored as TEXT are returned unchanged."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def _workflow_params(workflow_id: str, now_us: int, **fields: Optional[str]) -> Dict[str, Any]:
+    """Named parameters for _SQL_UPSERT_WORKFLOW; fields not given are left unchanged."""
+    params = dict.fromkeys(
+        ("user_prompt", "status", "output_path", "error_message") + _COMPRESSED_FIELDS
+    )
+    params.update(fields)
+    for field in _COMPRESSED_FIELDS:
+        params[field] = _compress(params[field])
+    params["workflow_id"] = workflow_id
+    params["now_us"] = now_us
+    return params
+
 
 class WorkflowDatabase:
     """SQLite database for workflow persistence."""
 
-    def __init__(self, db_path: str = "deepresearch.db"):
+    def __init__(self, db_path: str = "deepresearch.db", background_writes: bool = False):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            background_writes: Queue add_research_note, record_iteration and
+                record_search calls for a writer thread that commits them in
+                batches, instead of committing on the caller's thread. Those
+                calls then return a future that resolves once the write is
+                committed, or carries the error if it failed
         """
         self.db_path = Path(db_path)
-        self.connection = None
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._shared_connection: Optional[sqlite3.Connection] = None
+        self._write_queue: Optional[
+            "queue.Queue[Optional[Tuple[str, Tuple, concurrent.futures.Future]]]"
+        ] = None
+        self._writer: Optional[threading.Thread] = None
         self._initialize()
 
+        if background_writes:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="database-writer", daemon=True
+            )
+            self._writer.start()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection for the calling thread, opened on first use.
+
+        Each thread gets its own handle so WAL can serve readers while
+        another thread writes, instead of serialising on one connection.
+        """
+        if self._shared_connection is not None:
+            return self._shared_connection
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
     def _initialize(self):
         """Initialize database schema."""
-        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.connection.row_factory = sqlite3.Row
+        if str(self.db_path) == ":memory:":
+            # Every connection to :memory: opens a separate database, so all threads share one
+            self._shared_connection = self._connect()
         self._create_tables()
-        logger.info(f"Database initialized: {self.db_path}")
+        logger.info("Database initialized: %s", self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection to the database."""
+        # Only the owning thread uses it, but close() runs on whichever thread shuts down
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        self._configure_journal(connection)
+        # 64 MiB page cache, memory-mapped reads and in-memory temp tables for sorts and aggregates
+        connection.executescript(
+            """
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=10737418240;
+            PRAGMA cache_size=-65536;
+            """
+        )
+
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    def _configure_journal(self, connection: sqlite3.Connection):
+        """
+        Switch file databases to write-ahead logging.
+
+        WAL commits skip the rollback-journal fsync and let readers proceed
+        while a writer commits.
+        """
+        if str(self.db_path) == ":memory:":
+            return
+
+        mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if mode.lower() != "wal":
+            logger.warning("WAL journal mode unavailable, using %s", mode)
+            return
+
+        # NORMAL is durable across application crashes in WAL mode; only an OS crash can lose the last commits
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA journal_size_limit=64000000")
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several writes into one transaction on the calling thread.
+
+        Writes made inside the block share a single BEGIN DEFERRED/COMMIT
+        and are rolled back together if the block raises. Nested calls join
+        the outermost transaction.
+        """
+        if getattr(self._local, "in_transaction", False):
+            yield
+            return
+
+        connection = self.connection
+        connection.execute("BEGIN DEFERRED")
+        self._local.in_transaction = True
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        else:
+            connection.commit()
+        finally:
+            self._local.in_transaction = False
+
+    @property
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor reused by every call on the calling thread's connection."""
+        connection = self.connection
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None or cursor.connection is not connection:
+            cursor = connection.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Cursor]:
+        """Commit the enclosed writes, unless an enclosing transaction() will."""
+        cursor = self._cursor
+        if getattr(self._local, "in_transaction", False):
+            yield cursor
+            return
+
+        connection = cursor.connection
+        try:
+            yield cursor
+        except BaseException:
+            connection.rollback()
+            raise
+        else:
+            connection.commit()
+
+    def _checkpoint(self):
+        """
+        Copy the WAL back into the database file and truncate it.
+
+        Run when a workflow completes, so the WAL cannot keep growing across
+        long runs and slow down later reads. Deferred while a transaction()
+        is open, since a checkpoint cannot run inside one.
+        """
+        if str(self.db_path) == ":memory:" or getattr(self._local, "in_transaction", False):
+            return
+
+        busy, _, _ = self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            logger.debug("WAL checkpoint skipped, database busy")
+
+    def _writer_loop(self):
+        """Commit queued writes in batches until close() sends the stop marker."""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + _WRITE_WINDOW_S
+            while len(batch) < _WRITE_BATCH_SIZE and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            writes = [write for write in batch if write is not None]
+            try:
+                with self._write() as cursor:
+                    # Consecutive writes of one statement go through a single executemany
+                    for sql, group in itertools.groupby(writes, key=lambda write: write[0]):
+                        cursor.executemany(sql, [params for _, params, _ in group])
+            except sqlite3.Error as e:
+                logger.exception("Background write of %d rows failed", len(writes))
+                # The batch was one transaction, so every write in it was rolled back
+                for _, _, future in writes:
+                    future.set_exception(e)
+            else:
+                for _, _, future in writes:
+                    future.set_result(None)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+            if batch[-1] is None:
+                return
+
+    def _enqueue(self, sql: str, params: Tuple) -> concurrent.futures.Future:
+        """Queue a write for the background writer and return its future."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._write_queue.put((sql, params, future))
+        return future
+
+    def flush(self):
+        """Block until every queued background write has been committed."""
+        if self._write_queue is not None:
+            self._write_queue.join()
 
     def _create_tables(self):
         """Create database tables if they don't exist."""
         cursor = self.connection.cursor()
 
+        # Skip the DDL entirely for a database already at the current schema
+        if cursor.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION:
+            return
+
         # Workflows table
         cursor.execute(
             """
@@ -57,10 +406,14 @@ class WorkflowDatabase:
                 final_report TEXT,
                 summary TEXT,
                 output_path TEXT,
-                error_message TEXT
+                error_message TEXT,
+                created_at_us INTEGER,
+                completed_at_us INTEGER,
+                deleted_at TIMESTAMP
             )
             """
         )
+        self._migrate_workflows(cursor)
 
         # Research notes table
         cursor.execute(
@@ -77,6 +430,9 @@ class WorkflowDatabase:
             )
             """
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_research_notes_workflow ON research_notes(workflow_id)"
+        )
 
         # Iterations table (for tracking revisions)
         cursor.execute(
@@ -94,6 +450,9 @@ class WorkflowDatabase:
             )
             """
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_iterations_workflow ON iterations(workflow_id)"
+        )
 
         # User approvals table
         cursor.execute(
@@ -110,6 +469,9 @@ class WorkflowDatabase:
             )
             """
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_approvals_workflow ON approvals(workflow_id)"
+        )
 
         # Search history table
         cursor.execute(
@@ -125,10 +487,49 @@ class WorkflowDatabase:
             )
             """
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_history_workflow ON search_history(workflow_id)"
+        )
 
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self.connection.commit()
         logger.debug("Database tables created/verified")
 
+    def _migrate_workflows(self, cursor: sqlite3.Cursor):
+        """Add columns introduced after the first schema to older databases."""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(workflows)")}
+        for column, column_type in (
+            ("created_at_us", "INTEGER"),
+            ("completed_at_us", "INTEGER"),
+            ("deleted_at", "TIMESTAMP"),
+        ):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE workflows ADD COLUMN {column} {column_type}")
+
+        # Backfill epoch timestamps for rows written before those columns existed
+        cursor.execute(
+            """
+            UPDATE workflows
+            SET created_at_us = CAST(strftime('%s', created_at) AS INTEGER) * 1000000
+            WHERE created_at_us IS NULL AND created_at IS NOT NULL
+            """
+        )
+        cursor.execute(
+            """
+            UPDATE workflows
+            SET completed_at_us = CAST(strftime('%s', completed_at) AS INTEGER) * 1000000
+            WHERE completed_at_us IS NULL AND completed_at IS NOT NULL
+            """
+        )
+
+        # Listing only ever reads live workflows, newest first
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_active_workflows
+            ON workflows(created_at) WHERE deleted_at IS NULL
+            """
+        )
+
     def save_workflow(
         self,
         workflow_id: str,
@@ -143,19 +544,30 @@ class WorkflowDatabase:
             user_prompt: User's research prompt
             status: Workflow status
         """
-        cursor = self.connection.cursor()
+        self.upsert_workflow(workflow_id, user_prompt=user_prompt, status=status)
 
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO workflows
-            (workflow_id, user_prompt, status)
-            VALUES (?, ?, ?)
-            """,
-            (workflow_id, user_prompt, status),
-        )
+    def save_workflows_bulk(
+        self,
+        workflows: Iterable[Tuple[str, str]],
+        status: str = "in_progress",
+    ):
+        """
+        Save several workflows in one transaction.
 
-        self.connection.commit()
-        logger.info(f"Workflow saved: {workflow_id}")
+        Args:
+            workflows: (workflow_id, user_prompt) pairs
+            status: Status given to every workflow
+        """
+        now_us = time.time_ns() // 1000
+        rows = [
+            _workflow_params(workflow_id, now_us, user_prompt=user_prompt, status=status)
+            for workflow_id, user_prompt in workflows
+        ]
+
+        with self._write() as cursor:
+            cursor.executemany(_SQL_UPSERT_WORKFLOW, rows)
+
+        logger.info("Workflows saved: %d", len(rows))
 
     def update_workflow(
         self,
@@ -181,69 +593,114 @@ class WorkflowDatabase:
             output_path: Path to output file
             error_message: Error message if failed
         """
-        cursor = self.connection.cursor()
-
-        updates = []
-        values = []
-
-        if status is not None:
-            updates.append("status = ?")
-            values.append(status)
-
-        if research_plan is not None:
-            updates.append("research_plan = ?")
-            values.append(research_plan)
+        fields = {
+            "status": status,
+            "research_plan": research_plan,
+            "draft_report": draft_report,
+            "final_report": final_report,
+            "summary": summary,
+            "output_path": output_path,
+            "error_message": error_message,
+        }
+        if all(value is None for value in fields.values()):
+            return
 
-        if draft_report is not None:
-            updates.append("draft_report = ?")
-            values.append(draft_report)
+        self.upsert_workflow(workflow_id, **fields)
 
-        if final_report is not None:
-            updates.append("final_report = ?")
-            values.append(final_report)
+    def upsert_workflow(
+        self,
+        workflow_id: str,
+        user_prompt: str = None,
+        status: str = None,
+        research_plan: str = None,
+        draft_report: str = None,
+        final_report: str = None,
+        summary: str = None,
+        output_path: str = None,
+        error_message: str = None,
+    ):
+        """
+        Create a workflow, or update it if it already exists, in one statement.
 
-        if summary is not None:
-            updates.append("summary = ?")
-            values.append(summary)
+        Replaces a save_workflow call followed by update_workflow with a
+        single write. Fields left as None keep their stored values.
 
-        if output_path is not None:
-            updates.append("output_path = ?")
-            values.append(output_path)
+        Args:
+            workflow_id: Workflow identifier
+            user_prompt: User's research prompt, required for a new workflow
+            status: New status, "in_progress" for a new workflow if None
+            research_plan: Research plan content
+            draft_report: Draft report content
+            final_report: Final report content
+            summary: Executive summary
+            output_path: Path to output file
+            error_message: Error message if failed
+        """
+        params = _workflow_params(
+            workflow_id,
+            time.time_ns() // 1000,
+            user_prompt=user_prompt,
+            status=status,
+            research_plan=research_plan,
+            draft_report=draft_report,
+            final_report=final_report,
+            summary=summary,
+            output_path=output_path,
+            error_message=error_message,
+        )
 
-        if error_message is not None:
-            updates.append("error_message = ?")
-            values.append(error_message)
+        with self._write() as cursor:
+            cursor.execute(_SQL_UPSERT_WORKFLOW, params)
+        logger.info("Workflow upserted: %s", workflow_id)
 
         if status == "completed":
-            updates.append("completed_at = CURRENT_TIMESTAMP")
+            self._checkpoint()
 
-        if updates:
-            values.append(workflow_id)
-            query = f"UPDATE workflows SET {', '.join(updates)} WHERE workflow_id = ?"
-            cursor.execute(query, values)
-            self.connection.commit()
-            logger.info(f"Workflow updated: {workflow_id}")
-
-    def get_workflow(self, workflow_id: str) -> Optional[Dict]:
+    def get_workflow(self, workflow_id: str, include_reports: bool = False) -> Optional[Dict]:
         """
         Retrieve workflow information.
 
         Args:
             workflow_id: Workflow identifier
+            include_reports: Also return research_plan, draft_report,
+                final_report and summary
 
         Returns:
-            Workflow data or None
+            Workflow data, or None if it does not exist or was deleted
         """
-        cursor = self.connection.cursor()
+        cursor = self._cursor
 
-        cursor.execute("SELECT * FROM workflows WHERE workflow_id = ?", (workflow_id,))
+        cursor.execute(
+            _SQL_GET_WORKFLOW_FULL if include_reports else _SQL_GET_WORKFLOW,
+            (workflow_id,),
+        )
         row = cursor.fetchone()
 
         if row:
-            return dict(row)
+            workflow = dict(zip(_columns(cursor), row))
+            if include_reports:
+                for field in _COMPRESSED_FIELDS:
+                    workflow[field] = _decompress(workflow[field])
+            return workflow
 
         return None
 
+    def soft_delete(self, workflow_id: str) -> bool:
+        """
+        Mark a workflow as deleted, hiding it from lookups and history.
+
+        Args:
+            workflow_id: Workflow identifier
+
+        Returns:
+            True if a live workflow was marked deleted
+        """
+        with self._write() as cursor:
+            cursor.execute(_SQL_SOFT_DELETE, (workflow_id,))
+
+        logger.info("Workflow deleted: %s", workflow_id)
+        return cursor.rowcount > 0
+
     def add_research_note(
         self,
         workflow_id: str,
@@ -251,7 +708,7 @@ class WorkflowDatabase:
         source_url: Optional[str] = None,
         source_title: Optional[str] = None,
         category: Optional[str] = None,
-    ):
+    ) -> Union[int, concurrent.futures.Future]:
         """
         Add a research note.
 
@@ -261,22 +718,39 @@ class WorkflowDatabase:
             source_url: Source URL
             source_title: Source title
             category: Note category
+
+        Returns:
+            ID of the new note, or a future for the write if it was queued
+            for the background writer
         """
-        cursor = self.connection.cursor()
+        params = (workflow_id, note_content, source_url, source_title, category)
+        if self._write_queue is not None:
+            return self._enqueue(_SQL_INSERT_NOTE, params)
 
-        cursor.execute(
-            """
-            INSERT INTO research_notes
-            (workflow_id, note_content, source_url, source_title, category)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (workflow_id, note_content, source_url, source_title, category),
-        )
+        with self._write() as cursor:
+            cursor.execute(_SQL_INSERT_NOTE, params)
+        logger.debug("Research note added for workflow: %s", workflow_id)
+        return cursor.lastrowid
 
-        self.connection.commit()
-        logger.debug(f"Research note added for workflow: {workflow_id}")
+    def add_research_notes_bulk(
+        self,
+        workflow_id: str,
+        notes: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+    ):
+        """
+        Add several research notes in one transaction.
 
-    def get_research_notes(self, workflow_id: str) -> List[Dict]:
+        Args:
+            workflow_id: Workflow identifier
+            notes: (note_content, source_url, source_title, category) tuples
+        """
+        with self._write() as cursor:
+            cursor.executemany(
+                _SQL_INSERT_NOTE,
+                [(workflow_id, *note) for note in notes],
+            )
+
+    def get_research_notes(self, workflow_id: str) -> List[Tuple]:
         """
         Retrieve research notes for a workflow.
 
@@ -284,16 +758,35 @@ class WorkflowDatabase:
             workflow_id: Workflow identifier
 
         Returns:
-            List of research notes
+            List of research notes as namedtuples with one field per column
+        """
+        return list(self.iter_research_notes(workflow_id))
+
+    def iter_research_notes(self, workflow_id: str) -> Iterator[Tuple]:
         """
+        Stream research notes for a workflow without loading them all at once.
+
+        Rows are fetched from SQLite in chunks of ``_FETCH_SIZE``.
+
+        Args:
+            workflow_id: Workflow identifier
+
+        Yields:
+            Research notes as namedtuples with one field per column
+        """
+        self.flush()
+        # A cursor of its own, as the shared one may be reused while this is paused
         cursor = self.connection.cursor()
+        cursor.arraysize = _FETCH_SIZE
 
-        cursor.execute(
-            "SELECT * FROM research_notes WHERE workflow_id = ? ORDER BY created_at",
-            (workflow_id,),
-        )
+        cursor.execute(_SQL_GET_NOTES, (workflow_id,))
+        make_row = _row_type(_columns(cursor))._make
 
-        return [dict(row) for row in cursor.fetchall()]
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from map(make_row, rows)
 
     def record_iteration(
         self,
@@ -303,7 +796,7 @@ class WorkflowDatabase:
         input_content: str,
         output_content: str,
         feedback: Optional[str] = None,
-    ):
+    ) -> Union[int, concurrent.futures.Future]:
         """
         Record an iteration step.
 
@@ -314,27 +807,38 @@ class WorkflowDatabase:
             input_content: Input to this stage
             output_content: Output from this stage
             feedback: Any feedback provided
+
+        Returns:
+            ID of the new iteration record, or a future for the write if it
+            was queued for the background writer
         """
-        cursor = self.connection.cursor()
+        params = (workflow_id, iteration_number, stage, input_content, output_content, feedback)
+        if self._write_queue is not None:
+            return self._enqueue(_SQL_INSERT_ITERATION, params)
 
-        cursor.execute(
-            """
-            INSERT INTO iterations
-            (workflow_id, iteration_number, stage, input_content, output_content, feedback)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                workflow_id,
-                iteration_number,
-                stage,
-                input_content,
-                output_content,
-                feedback,
-            ),
-        )
+        with self._write() as cursor:
+            cursor.execute(_SQL_INSERT_ITERATION, params)
+        logger.debug("Iteration recorded: %s, stage: %s", workflow_id, stage)
+        return cursor.lastrowid
 
-        self.connection.commit()
-        logger.debug(f"Iteration recorded: {workflow_id}, stage: {stage}")
+    def record_iterations_bulk(
+        self,
+        workflow_id: str,
+        iterations: Iterable[Tuple[int, str, str, str, Optional[str]]],
+    ):
+        """
+        Record several iteration steps in one transaction.
+
+        Args:
+            workflow_id: Workflow identifier
+            iterations: (iteration_number, stage, input_content, output_content,
+                feedback) tuples
+        """
+        with self._write() as cursor:
+            cursor.executemany(
+                _SQL_INSERT_ITERATION,
+                [(workflow_id, *iteration) for iteration in iterations],
+            )
 
     def record_approval(
         self,
@@ -354,21 +858,17 @@ class WorkflowDatabase:
             approved: Whether it was approved
             notes: User notes
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO approvals
-            (workflow_id, approval_type, content, approved, notes)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (workflow_id, approval_type, content, approved, notes),
-        )
+        with self._write() as cursor:
+            cursor.execute(
+                _SQL_INSERT_APPROVAL,
+                (workflow_id, approval_type, content, approved, notes),
+            )
 
-        self.connection.commit()
         logger.info(
-            f"Approval recorded: {workflow_id}, "
-            f"type: {approval_type}, approved: {approved}"
+            "Approval recorded: %s, type: %s, approved: %s",
+            workflow_id,
+            approval_type,
+            approved,
         )
 
     def record_search(
@@ -377,7 +877,7 @@ class WorkflowDatabase:
         search_type: str,
         query: str,
         results_count: int,
-    ):
+    ) -> Optional[concurrent.futures.Future]:
         """
         Record a search operation.
 
@@ -386,42 +886,55 @@ class WorkflowDatabase:
             search_type: Type of search (web, scholar, etc.)
             query: Search query
             results_count: Number of results
-        """
-        cursor = self.connection.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO search_history
-            (workflow_id, search_type, query, results_count)
-            VALUES (?, ?, ?, ?)
-            """,
-            (workflow_id, search_type, query, results_count),
-        )
+        Returns:
+            A future for the write if it was queued for the background
+            writer, otherwise None
+        """
+        params = (workflow_id, search_type, query, results_count)
+        if self._write_queue is not None:
+            return self._enqueue(_SQL_INSERT_SEARCH, params)
 
-        self.connection.commit()
+        with self._write() as cursor:
+            cursor.execute(_SQL_INSERT_SEARCH, params)
         logger.debug(
-            f"Search recorded: {search_type} - {query[:50]} "
-            f"({results_count} results)"
+            "Search recorded: %s - %.50s (%d results)",
+            search_type,
+            query,
+            results_count,
         )
 
-    def get_workflow_history(self) -> List[Dict]:
+    def record_searches_bulk(
+        self,
+        workflow_id: str,
+        searches: Iterable[Tuple[str, str, int]],
+    ):
+        """
+        Record several search operations in one transaction.
+
+        Args:
+            workflow_id: Workflow identifier
+            searches: (search_type, query, results_count) tuples
+        """
+        with self._write() as cursor:
+            cursor.executemany(
+                _SQL_INSERT_SEARCH,
+                [(workflow_id, *search) for search in searches],
+            )
+
+    def get_workflow_history(self) -> List[Tuple]:
         """
         Get all workflows in history.
 
         Returns:
-            List of all workflows
+            List of all workflows that have not been deleted, as namedtuples
+            with one field per column
         """
-        cursor = self.connection.cursor()
+        cursor = self._cursor
 
-        cursor.execute(
-            """
-            SELECT workflow_id, user_prompt, created_at, status, output_path
-            FROM workflows
-            ORDER BY created_at DESC
-            """
-        )
+        cursor.execute(_SQL_WORKFLOW_HISTORY)
 
-        return [dict(row) for row in cursor.fetchall()]
+        return list(map(_row_type(_columns(cursor))._make, cursor.fetchall()))
 
     def get_statistics(self, workflow_id: str) -> Dict[str, Any]:
         """
@@ -433,47 +946,29 @@ class WorkflowDatabase:
         Returns:
             Dictionary with workflow statistics
         """
-        cursor = self.connection.cursor()
+        self.flush()
+        cursor = self._cursor
 
-        # Get iteration count
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM iterations WHERE workflow_id = ?",
-            (workflow_id,),
-        )
-        iteration_count = cursor.fetchone()["count"]
+        # All four counts in one statement and one fetch
+        cursor.execute(_SQL_STATISTICS, (workflow_id,) * 4)
 
-        # Get note count
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM research_notes WHERE workflow_id = ?",
-            (workflow_id,),
-        )
-        note_count = cursor.fetchone()["count"]
-
-        # Get search count
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM search_history WHERE workflow_id = ?",
-            (workflow_id,),
-        )
-        search_count = cursor.fetchone()["count"]
-
-        # Get approval count
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM approvals WHERE workflow_id = ?",
-            (workflow_id,),
-        )
-        approval_count = cursor.fetchone()["count"]
-
-        return {
-            "iterations": iteration_count,
-            "notes": note_count,
-            "searches": search_count,
-            "approvals": approval_count,
-        }
+        return dict(zip(_columns(cursor), cursor.fetchone()))
 
     def close(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
+        """Commit any queued writes, then close every connection opened by any thread."""
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._write_queue = None
+
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+        self._shared_connection = None
+        if connections:
             logger.info("Database connection closed")
 
 
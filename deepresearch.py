@@ -8,12 +8,13 @@ to conduct comprehensive research and generate professional reports.
 import asyncio
 import json
 import os
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import logging
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from agents.deep_agents import (
     PlanningAgent,
     ResearchAgent,
@@ -23,13 +24,30 @@ from agents.deep_agents import (
     FormattingAgent,
     SummaryAgent,
     FactCheckingAgent,
+    WORKFLOW_DAG,
 )
+from agents.cache import SimilarityCache, deduplicated_run
+from agents.compiled import CompiledOutputError, run_compiled, should_compile
+from agents.scheduler import run_dag
 from tools.registry import ToolRegistry
 from models.agent import Agent
 from utils.config import load_config
+from utils.llm_cache import cached_create
 from utils.logging import setup_logger
 from error_recovery import retry_with_backoff, ResilientOperation
 
+# orjson serializes large workflow states much faster than json when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional PDF output; WeasyPrint also raises OSError when its native libraries are missing
+try:
+    from weasyprint import HTML
+except (ImportError, OSError):
+    HTML = None
+
 # Optional database support
 try:
     from database import get_database
@@ -38,6 +56,186 @@ except ImportError:
     HAS_DATABASE = False
 
 
+# Review feedback containing any of these phrases approves the report
+_APPROVAL_RE = re.compile(r"excellent|no major issues|ready to publish", re.IGNORECASE)
+
+# Accepted answers to an approval prompt
+_YES = frozenset({"y", "yes"})
+_NO = frozenset({"n", "no"})
+
+# Response length limit for each stage's agent
+_STAGE_MAX_TOKENS = {
+    "planning": 2000,
+    "research": 3000,
+    "write": 4000,
+    "review": 2000,
+    "revision": 4000,
+    "factchecking": 2000,
+    "formatting": 4000,
+    "summary": 1000,
+}
+
+# Stages run on a cheaper model tier from config.model_tiers; the rest use config.model
+_STAGE_MODEL_TIERS = {
+    "formatting": "nano",
+    "summary": "nano",
+}
+
+# User message template for each single-call stage, and whether to stream its response
+_STAGE_REQUESTS = {
+    "planning": ("Create a comprehensive research plan for: {user_prompt}", False),
+    "research": (
+        "Topic: {user_prompt}\n\n"
+        "Research Plan:\n{plan}\n\n"
+        "Please conduct thorough research following this plan "
+        "and provide detailed notes with sources.",
+        True,
+    ),
+    "write": (
+        "Topic: {user_prompt}\n\n"
+        "Research Notes:\n{research_notes}\n\n"
+        "Please write a comprehensive, well-structured report "
+        "based on these research notes.",
+        True,
+    ),
+    "factchecking": ("Please fact-check this report:\n\n{report}", False),
+    "formatting": (
+        "Please format this report with proper structure, "
+        "headings, and professional styling:\n\n{report}",
+        True,
+    ),
+    "summary": ("Please create an executive summary of this report:\n\n{report}", False),
+}
+
+# Stages whose response is reused for an identical request. Planning always
+# calls the model so a rejected plan is not replayed for the same topic, as do
+# research, writing and the review/revision loop
+_CACHED_STAGES = frozenset({"factchecking", "formatting", "summary"})
+
+# Marks a content block as a prompt-cache breakpoint for the Anthropic API
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+def _cached_text(text: str) -> Dict[str, Any]:
+    """Text content block that Anthropic may serve from its prompt cache.
+
+    Only worth it for prefixes repeated verbatim, such as system prompts;
+    each review and revision sends a new report, so those are left unmarked.
+    """
+    return {"type": "text", "text": text, "cache_control": _EPHEMERAL_CACHE}
+
+
+# Report page; CSS braces are doubled for str.format
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Research Report</title>
+    <style>
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 900px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }}
+        .container {{
+            background-color: white;
+            padding: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        h1 {{
+            color: #2c3e50;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }}
+        h2 {{
+            color: #34495e;
+            margin-top: 30px;
+        }}
+        .summary {{
+            background-color: #ecf0f1;
+            padding: 15px;
+            border-left: 4px solid #3498db;
+            margin: 20px 0;
+        }}
+        .timestamp {{
+            color: #7f8c8d;
+            font-size: 0.9em;
+        }}
+        code {{
+            background-color: #f8f8f8;
+            padding: 2px 6px;
+            border-radius: 3px;
+        }}
+        pre {{
+            background-color: #f8f8f8;
+            padding: 10px;
+            border-radius: 3px;
+            overflow-x: auto;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Research Report</h1>
+        <p class="timestamp">Generated: {generated_at}</p>
+
+        <div class="summary">
+            <h2>Executive Summary</h2>
+            {summary}
+        </div>
+
+        <h2>Full Report</h2>
+        {formatted_report}
+    </div>
+</body>
+</html>
+"""
+
+
+# Page before and after the report body, so the report is written straight
+# into the file rather than copied into one page-sized string
+_HTML_HEAD, _HTML_TAIL = _HTML_TEMPLATE.split("{formatted_report}")
+
+
+def _write_documents(
+    head: str, formatted_report: str, html_path: Path, pdf_path: Optional[Path]
+) -> None:
+    """Write the report HTML and, if ``pdf_path`` is given, render it to PDF."""
+    with html_path.open("w", encoding="utf-8") as f:
+        f.write(head)
+        f.write(formatted_report)
+        f.write(_HTML_TAIL)
+    if pdf_path is not None:
+        HTML(filename=str(html_path)).write_pdf(str(pdf_path))
+
+
+# State fields saved to their own files instead of inline in the state JSON once this large
+_SPILLED_FIELDS = ("research_notes", "draft_report", "revised_report", "formatted_report")
+_SPILL_MIN_CHARS = 4096
+
+
+class _PlanRejected(Exception):
+    """Raised by the planning stage when the user rejects the plan."""
+
+
+# WorkflowState attribute each workflow stage's result is stored in
+_STAGE_STATE_FIELDS = {
+    "planning": "research_plan",
+    "research": "research_notes",
+    "write": "draft_report",
+    "revision": "revised_report",
+    "formatting": "formatted_report",
+    "summary": "summary",
+}
+
+
 class WorkflowState:
     """Manages the state of a research workflow execution."""
 
@@ -79,11 +277,29 @@ class WorkflowState:
         }
 
     def save(self, output_dir: Path):
-        """Save state to JSON file."""
+        """
+        Save state to JSON file.
+
+        Report fields of at least ``_SPILL_MIN_CHARS`` characters are written
+        to ``<output_dir>/<workflow_id>/<field>.md`` and stored in the JSON as
+        ``{"$ref": "<workflow_id>/<field>.md"}``.
+        """
         output_dir.mkdir(parents=True, exist_ok=True)
         state_file = output_dir / f"workflow_{self.workflow_id}.json"
-        with open(state_file, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+
+        data = self.to_dict()
+        for field in _SPILLED_FIELDS:
+            if len(data[field]) >= _SPILL_MIN_CHARS:
+                ref = f"{self.workflow_id}/{field}.md"
+                (output_dir / self.workflow_id).mkdir(exist_ok=True)
+                (output_dir / ref).write_text(data[field], encoding="utf-8")
+                data[field] = {"$ref": ref}
+
+        if orjson is not None:
+            state_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(state_file, "w") as f:
+                json.dump(data, f, indent=2)
         return state_file
 
 
@@ -95,12 +311,29 @@ class DeepResearchWorkflow:
     generate reports, and produce professional documents.
     """
 
-    def __init__(self, config_path: str = ".config/config.yaml"):
-        """Initialize the workflow with configuration."""
+    def __init__(
+        self,
+        config_path: str = ".config/config.yaml",
+        fast_path: bool = False,
+        cache_responses: bool = True,
+    ):
+        """
+        Initialize the workflow with configuration.
+
+        Args:
+            config_path: Path to the configuration file
+            fast_path: Run short topics as a single compiled LLM call, skipping
+                the interactive plan approval
+            cache_responses: Serve repeated requests for the stages in
+                ``_CACHED_STAGES`` from the on-disk response cache
+        """
         self.logger = setup_logger("DeepResearchWorkflow")
+        self.config_path = config_path
         self.config = load_config(config_path)
+        self.fast_path = fast_path
+        self.cache_responses = cache_responses
         self.tool_registry = ToolRegistry()
-        self.client = Anthropic()
+        self.client = AsyncAnthropic()
         self.output_dir = Path("output")
         self.max_iterations = int(os.getenv("MAX_ITERATIONS", 3))
 
@@ -118,6 +351,21 @@ class DeepResearchWorkflow:
         self.summary_agent = SummaryAgent()
         self.factchecking_agent = FactCheckingAgent()
 
+        # Request settings per stage, built once instead of on every call
+        config = self.config
+        self._agent_cfg = {
+            name: {
+                "model": (
+                    config.model_tiers[_STAGE_MODEL_TIERS[name]]
+                    if name in _STAGE_MODEL_TIERS
+                    else config.model
+                ),
+                "max_tokens": max_tokens,
+                "system": [_cached_text(getattr(self, f"{name}_agent").system_prompt)],
+            }
+            for name, max_tokens in _STAGE_MAX_TOKENS.items()
+        }
+
         self.logger.info("All agents initialized successfully")
 
     async def execute(self, user_prompt: str) -> Dict[str, Any]:
@@ -131,72 +379,45 @@ class DeepResearchWorkflow:
             Dictionary containing workflow results and output path
         """
         # Create workflow state
-        workflow_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One timestamp names the workflow, its state and its output files
+        started_at = datetime.now()
+        workflow_id = started_at.strftime("%Y%m%d_%H%M%S")
         state = WorkflowState(workflow_id)
+        state.created_at = started_at
         state.user_prompt = user_prompt
 
         self.logger.info(f"Starting workflow {workflow_id} for: {user_prompt}")
 
         try:
-            # Step 1: Generate research plan
-            self.logger.info("Step 1: Generating research plan...")
-            state.research_plan = await self._generate_plan(user_prompt)
-            self.logger.debug(f"Generated plan:\n{state.research_plan}")
-
-            # Step 2: Human review of plan
-            self.logger.info("Step 2: Awaiting human approval of plan...")
-            state.plan_approved = self._get_user_approval(
-                "Research Plan",
-                state.research_plan,
+            if self.fast_path and should_compile(user_prompt):
+                # The compiled call runs on OpenAI; without a key, or if its output
+                # is incomplete, the regular workflow runs instead
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    self.logger.warning(
+                        "OPENAI_API_KEY is not set; skipping the compiled fast path"
+                    )
+                else:
+                    try:
+                        return await self._execute_compiled(state, api_key)
+                    except CompiledOutputError as e:
+                        self.logger.warning(
+                            "Compiled fast path failed (%s); running the full workflow", e
+                        )
+
+            # Steps 1-8: planning through summary, each stage starting once
+            # the stages it depends on have finished
+            await run_dag(
+                WORKFLOW_DAG,
+                lambda stage, deps: self._run_stage(stage, deps, state),
             )
 
-            if not state.plan_approved:
-                self.logger.info("Plan rejected by user. Workflow cancelled.")
-                return {"status": "cancelled", "reason": "Plan rejected by user"}
-
-            # Step 3: Execute research
-            self.logger.info("Step 3: Executing research plan...")
-            state.research_notes = await self._execute_research(
-                user_prompt,
-                state.research_plan,
-            )
-            self.logger.debug(f"Research notes length: {len(state.research_notes)}")
-
-            # Step 4: Write report
-            self.logger.info("Step 4: Writing report...")
-            state.draft_report = await self._write_report(
-                user_prompt,
-                state.research_notes,
-            )
-            self.logger.debug(f"Draft report length: {len(state.draft_report)}")
-
-            # Step 5: Review and revision loop
-            self.logger.info("Step 5: Review and revision loop...")
-            state.revised_report = await self._review_and_revise(
-                state.draft_report,
-                state,
-            )
-
-            # Step 6: Fact-check
-            self.logger.info("Step 6: Fact-checking report...")
-            fact_check_notes = await self._fact_check(state.revised_report)
-            self.logger.debug(f"Fact-check completed")
-
-            # Step 7: Format document
-            self.logger.info("Step 7: Formatting document...")
-            state.formatted_report = await self._format_document(
-                state.revised_report
-            )
-
-            # Step 8: Generate summary
-            self.logger.info("Step 8: Generating summary...")
-            state.summary = await self._generate_summary(state.formatted_report)
-
             # Step 9: Create final document
             self.logger.info("Step 9: Creating final document...")
             state.final_document_path = await self._create_final_document(
                 state.formatted_report,
                 state.summary,
+                state.created_at,
             )
 
             self.logger.info(
@@ -205,7 +426,7 @@ class DeepResearchWorkflow:
             )
 
             # Save state
-            state_file = state.save(self.output_dir)
+            state_file = await asyncio.to_thread(state.save, self.output_dir)
 
             return {
                 "status": "success",
@@ -215,140 +436,201 @@ class DeepResearchWorkflow:
                 "summary": state.summary,
             }
 
+        except _PlanRejected:
+            self.logger.info("Plan rejected by user. Workflow cancelled.")
+            return {"status": "cancelled", "reason": "Plan rejected by user"}
+
         except Exception as e:
             self.logger.error(f"Workflow {workflow_id} failed: {str(e)}")
             state.errors.append(str(e))
-            state.save(self.output_dir)
+            await asyncio.to_thread(state.save, self.output_dir)
             raise
 
+    async def _run_stage(self, stage: str, deps: Dict[str, str], state: WorkflowState) -> str:
+        """
+        Run one stage of ``WORKFLOW_DAG`` and record its result on ``state``.
+
+        Args:
+            stage: Stage name
+            deps: Results of the stages ``stage`` depends on
+            state: Workflow state being filled in
+
+        Returns:
+            The stage's output text
+        """
+        self.logger.info("Running %s stage...", stage)
+        user_prompt = state.user_prompt
+        if stage == "planning":
+            result = await self._plan_and_approve(state)
+        elif stage == "research":
+            result = await self._execute_research(user_prompt, deps["planning"])
+        elif stage == "write":
+            result = await self._write_report(user_prompt, deps["research"])
+        elif stage == "revision":
+            result = await self._review_and_revise(deps["write"], state)
+        elif stage == "factchecking":
+            result = await self._fact_check(deps["revision"])
+        elif stage == "formatting":
+            result = await self._format_document(deps["revision"])
+        elif stage == "summary":
+            result = await self._generate_summary(deps["formatting"])
+        else:
+            raise ValueError(f"Unknown workflow stage: {stage}")
+
+        if stage in _STAGE_STATE_FIELDS:
+            setattr(state, _STAGE_STATE_FIELDS[stage], result)
+        self.logger.debug("%s output length: %d", stage, len(result))
+        return result
+
+    async def _plan_and_approve(self, state: WorkflowState) -> str:
+        """Generate the research plan and have the user approve it."""
+        plan = await self._generate_plan(state.user_prompt)
+        self.logger.debug("Generated plan:\n%s", plan)
+
+        self.logger.info("Awaiting human approval of plan...")
+        state.plan_approved = await self._get_user_approval("Research Plan", plan)
+        if not state.plan_approved:
+            state.research_plan = plan
+            raise _PlanRejected()
+        return plan
+
+    async def _execute_compiled(self, state: WorkflowState, api_key: str) -> Dict[str, Any]:
+        """Run the whole workflow for a short topic as one structured LLM call."""
+        self.logger.info("Running compiled fast path...")
+        stages = await run_compiled(state.user_prompt, api_key, self.config_path)
+        state.research_plan = stages["plan"]
+        state.plan_approved = True
+        state.research_notes = stages["notes"]
+        state.draft_report = stages["report"]
+        state.review_feedback = stages["review"]
+        state.revised_report = stages["revision"]
+        state.formatted_report = stages["formatted"]
+        state.summary = stages["summary"]
+        state.metadata["compiled"] = True
+
+        state.final_document_path = await self._create_final_document(
+            state.formatted_report,
+            state.summary,
+            state.created_at,
+        )
+        state_file = await asyncio.to_thread(state.save, self.output_dir)
+
+        return {
+            "status": "success",
+            "workflow_id": state.workflow_id,
+            "output_path": state.final_document_path,
+            "state_file": str(state_file),
+            "summary": state.summary,
+        }
+
     async def _generate_plan(self, user_prompt: str) -> str:
         """Generate research plan using planning agent."""
-        system_prompt = self.planning_agent.system_prompt.replace(
-            "[INSERT TOPIC HERE]", user_prompt
-        )
+        return await self._run_agent("planning", user_prompt=user_prompt)
 
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=2000,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Create a comprehensive research plan for: {user_prompt}",
-                }
-            ],
-        )
+    async def _run_agent(self, name: str, **fmt: str) -> str:
+        """
+        Run one stage's agent on its user message template.
 
-        return message.content[0].text
+        Args:
+            name: Stage name, a key of ``_STAGE_REQUESTS``
+            **fmt: Values substituted into the stage's template
 
-    async def _execute_research(self, user_prompt: str, plan: str) -> str:
-        """Execute research using research agent."""
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=3000,
-            system=self.research_agent.system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        f"Topic: {user_prompt}\n\n"
-                        f"Research Plan:\n{plan}\n\n"
-                        "Please conduct thorough research following this plan "
-                        "and provide detailed notes with sources."
-                    ),
-                }
-            ],
+        Returns:
+            The agent's response text
+        """
+        template, stream = _STAGE_REQUESTS[name]
+        return await cached_create(
+            self.client,
+            stream=stream,
+            cache=self.cache_responses and name in _CACHED_STAGES,
+            **self._agent_cfg[name],
+            messages=[{"role": "user", "content": template.format(**fmt)}],
         )
 
-        research_text = message.content[0].text
-
-        return research_text
+    async def _execute_research(self, user_prompt: str, plan: str) -> str:
+        """Execute research using research agent."""
+        return await self._run_agent("research", user_prompt=user_prompt, plan=plan)
 
     async def _write_report(self, user_prompt: str, research_notes: str) -> str:
         """Generate draft report using write agent."""
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=4000,
-            system=self.write_agent.system_prompt,
+        return await self._run_agent(
+            "write", user_prompt=user_prompt, research_notes=research_notes
+        )
+
+    async def _review(self, report: str) -> str:
+        """Get review feedback on a report."""
+        return await cached_create(
+            self.client,
+            cache=False,
+            **self._agent_cfg["review"],
             messages=[
                 {
                     "role": "user",
-                    "content": (
-                        f"Topic: {user_prompt}\n\n"
-                        f"Research Notes:\n{research_notes}\n\n"
-                        "Please write a comprehensive, well-structured report "
-                        "based on these research notes."
-                    ),
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "Please review this report and provide constructive feedback:",
+                        },
+                        {"type": "text", "text": report},
+                    ],
                 }
             ],
         )
 
-        return message.content[0].text
-
     async def _review_and_revise(self, draft: str, state: WorkflowState) -> str:
         """Review and revise report with iteration limit."""
         current_report = draft
         max_revisions = self.max_iterations
+        # Reuses feedback when a revision leaves the report nearly unchanged;
+        # local to this run so no other workflow's feedback is returned
+        review_cache = SimilarityCache()
 
         for iteration in range(max_revisions):
             state.iteration_count["revision"] = iteration + 1
 
             # Review
             self.logger.info(f"Review iteration {iteration + 1}/{max_revisions}")
-            review = self.client.messages.create(
-                model=self.config.provider.model,
-                max_tokens=2000,
-                system=self.review_agent.system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Please review this report and provide constructive feedback:\n\n"
-                            f"{current_report}"
-                        ),
-                    }
-                ],
+            feedback = await deduplicated_run(
+                self._review, current_report, review_cache, iteration=iteration
             )
 
-            feedback = review.content[0].text
             state.review_feedback = feedback
 
             # Check if report is good enough
-            if (
-                "excellent" in feedback.lower()
-                or "no major issues" in feedback.lower()
-                or "ready to publish" in feedback.lower()
-            ):
+            if _APPROVAL_RE.search(feedback):
                 self.logger.info("Report approved after review")
                 return current_report
 
             # Revise based on feedback
             self.logger.info(f"Revising report based on feedback...")
-            revision = self.client.messages.create(
-                model=self.config.provider.model,
-                max_tokens=4000,
-                system=self.revision_agent.system_prompt,
+            current_report = await cached_create(
+                self.client,
+                cache=False,
+                **self._agent_cfg["revision"],
                 messages=[
                     {
                         "role": "user",
-                        "content": (
-                            f"Original Report:\n{current_report}\n\n"
-                            f"Review Feedback:\n{feedback}\n\n"
-                            "Please revise the report based on this feedback."
-                        ),
+                        "content": [
+                            {"type": "text", "text": f"Original Report:\n{current_report}"},
+                            {
+                                "type": "text",
+                                "text": (
+                                    f"Review Feedback:\n{feedback}\n\n"
+                                    "Please revise the report based on this feedback."
+                                ),
+                            },
+                        ],
                     }
                 ],
             )
 
-            current_report = revision.content[0].text
-
         self.logger.warning(
             f"Reached max revisions ({max_revisions}). "
             "Escalating for human review."
         )
 
         # Escalation: ask user for approval
-        user_approved = self._get_user_approval(
+        user_approved = await self._get_user_approval(
             "Report After Max Revisions",
             current_report,
             state.review_feedback,
@@ -361,61 +643,21 @@ class DeepResearchWorkflow:
 
     async def _fact_check(self, report: str) -> str:
         """Perform fact-checking on the report."""
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=2000,
-            system=self.factchecking_agent.system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Please fact-check this report:\n\n{report}",
-                }
-            ],
-        )
-
-        return message.content[0].text
+        return await self._run_agent("factchecking", report=report)
 
     async def _format_document(self, report: str) -> str:
         """Format document using formatting agent."""
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=4000,
-            system=self.formatting_agent.system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        f"Please format this report with proper structure, "
-                        f"headings, and professional styling:\n\n{report}"
-                    ),
-                }
-            ],
-        )
-
-        return message.content[0].text
+        return await self._run_agent("formatting", report=report)
 
     async def _generate_summary(self, report: str) -> str:
         """Generate executive summary using summary agent."""
-        message = self.client.messages.create(
-            model=self.config.provider.model,
-            max_tokens=1000,
-            system=self.summary_agent.system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        f"Please create an executive summary of this report:\n\n{report}"
-                    ),
-                }
-            ],
-        )
-
-        return message.content[0].text
+        return await self._run_agent("summary", report=report)
 
     async def _create_final_document(
         self,
         formatted_report: str,
         summary: str,
+        generated_at: Optional[datetime] = None,
     ) -> str:
         """
         Create final formatted document (HTML/PDF).
@@ -423,6 +665,8 @@ class DeepResearchWorkflow:
         Args:
             formatted_report: The formatted report content
             summary: The executive summary
+            generated_at: Time used in the file names and report header;
+                defaults to now
 
         Returns:
             Path to the generated document
@@ -430,102 +674,32 @@ class DeepResearchWorkflow:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         # Create HTML document
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = generated_at or datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         html_path = self.output_dir / f"report_{timestamp}.html"
 
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Research Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 40px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #34495e;
-            margin-top: 30px;
-        }}
-        .summary {{
-            background-color: #ecf0f1;
-            padding: 15px;
-            border-left: 4px solid #3498db;
-            margin: 20px 0;
-        }}
-        .timestamp {{
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-        code {{
-            background-color: #f8f8f8;
-            padding: 2px 6px;
-            border-radius: 3px;
-        }}
-        pre {{
-            background-color: #f8f8f8;
-            padding: 10px;
-            border-radius: 3px;
-            overflow-x: auto;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Research Report</h1>
-        <p class="timestamp">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-
-        <div class="summary">
-            <h2>Executive Summary</h2>
-            {summary}
-        </div>
-
-        <h2>Full Report</h2>
-        {formatted_report}
-    </div>
-</body>
-</html>
-"""
+        head = _HTML_HEAD.format(
+            generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
+            summary=summary,
+        )
 
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Writing and PDF rendering run together on one worker thread,
+        # keeping disk I/O and the CPU-heavy render off the event loop
+        pdf_path = None if HTML is None else self.output_dir / f"report_{timestamp}.pdf"
+        await asyncio.to_thread(_write_documents, head, formatted_report, html_path, pdf_path)
 
         self.logger.info(f"HTML document created: {html_path}")
 
-        # Try to create PDF if weasyprint is available
-        pdf_path = None
-        try:
-            from weasyprint import HTML
-
-            pdf_path = self.output_dir / f"report_{timestamp}.pdf"
-            HTML(string=html_content).write_pdf(str(pdf_path))
-            self.logger.info(f"PDF document created: {pdf_path}")
-            return str(pdf_path)
-        except ImportError:
+        if pdf_path is None:
             self.logger.warning(
                 "WeasyPrint not available. Using HTML output instead."
             )
             return str(html_path)
 
-    def _get_user_approval(
+        self.logger.info(f"PDF document created: {pdf_path}")
+        return str(pdf_path)
+
+    async def _get_user_approval(
         self,
         item_name: str,
         content: str,
@@ -558,13 +732,13 @@ class DeepResearchWorkflow:
 
         print("\n" + "=" * 80)
         while True:
-            response = (
-                input("Do you approve? (yes/no/show_full): ").strip().lower()
-            )
-            if response in ["yes", "y"]:
+            # Read on a worker thread so other tasks keep running while waiting
+            response = await asyncio.to_thread(input, "Do you approve? (yes/no/show_full): ")
+            response = response.strip().lower()
+            if response in _YES:
                 print("✓ Approved by user\n")
                 return True
-            elif response in ["no", "n"]:
+            elif response in _NO:
                 print("✗ Rejected by user\n")
                 return False
             elif response == "show_full":
@@ -10,7 +10,9 @@ Provides:
 
 import asyncio
 import logging
-from typing import Callable, Optional, Any, TypeVar
+import random
+from collections import deque
+from typing import Callable, Deque, Optional, Any, List, Tuple, TypeVar
 from enum import Enum
 
 logger = logging.getLogger("error_recovery")
@@ -37,19 +39,69 @@ class ErrorCategory(Enum):
     UNKNOWN_ERROR = "unknown_error"  # Unclassified errors
 
 
+# Exception types mapped to categories, checked in order so subclasses come first
+_ERROR_TYPES: List[Tuple[type, ErrorCategory]] = [
+    (asyncio.TimeoutError, ErrorCategory.TIMEOUT_ERROR),
+    (TimeoutError, ErrorCategory.TIMEOUT_ERROR),
+]
+
+try:
+    import anthropic
+
+    _ERROR_TYPES += [
+        (anthropic.APITimeoutError, ErrorCategory.TIMEOUT_ERROR),
+        (anthropic.APIConnectionError, ErrorCategory.NETWORK_ERROR),
+        (anthropic.APIStatusError, ErrorCategory.API_ERROR),
+    ]
+except ImportError:
+    pass
+
+try:
+    import httpx
+
+    _ERROR_TYPES += [
+        (httpx.TimeoutException, ErrorCategory.TIMEOUT_ERROR),
+        (httpx.TransportError, ErrorCategory.NETWORK_ERROR),
+        (httpx.HTTPStatusError, ErrorCategory.API_ERROR),
+    ]
+except ImportError:
+    pass
+
+try:
+    import pydantic
+
+    _ERROR_TYPES.append((pydantic.ValidationError, ErrorCategory.VALIDATION_ERROR))
+except ImportError:
+    pass
+
+# Plain ValueError is left to the message fallback: subclasses such as
+# json.JSONDecodeError usually come from a malformed response worth retrying
+_ERROR_TYPES += [
+    (ConnectionError, ErrorCategory.NETWORK_ERROR),
+    (MemoryError, ErrorCategory.RESOURCE_ERROR),
+]
+
+
 def categorize_error(error: Exception) -> ErrorCategory:
     """
     Categorize an exception into known error types.
 
+    Known exception types are matched directly; the message is only
+    searched for keywords when the type is not recognised.
+
     Args:
         error: The exception to categorize
 
     Returns:
         ErrorCategory classification
     """
+    for error_type, category in _ERROR_TYPES:
+        if isinstance(error, error_type):
+            return category
+
     error_str = str(error).lower()
 
-    if "timeout" in error_str or isinstance(error, asyncio.TimeoutError):
+    if "timeout" in error_str:
         return ErrorCategory.TIMEOUT_ERROR
 
     if "api" in error_str or "401" in error_str or "403" in error_str:
@@ -97,6 +149,25 @@ def get_error_severity(error: Exception) -> ErrorSeverity:
     return ErrorSeverity.DEGRADED
 
 
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested wait from an HTTP error's Retry-After header.
+
+    Args:
+        error: The exception raised by the failed call
+
+    Returns:
+        Seconds to wait, or None if the error carries no usable header
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
 async def retry_with_backoff(
     func: Callable[..., Any],
     *args,
@@ -124,16 +195,19 @@ async def retry_with_backoff(
     Raises:
         Exception: Final exception if all retries fail
     """
+    # Nothing to retry, so skip the attempt bookkeeping entirely
+    if max_retries <= 0:
+        return await func(*args, **kwargs)
+
     last_exception = None
     delay = initial_delay
 
     for attempt in range(max_retries + 1):
         try:
-            logger.info(
-                f"Attempt {attempt + 1}/{max_retries + 1} to execute {func.__name__}"
-            )
             result = await func(*args, **kwargs)
-            logger.info(f"{func.__name__} succeeded on attempt {attempt + 1}")
+            # Only retried calls are worth reporting; first-try success is the norm
+            if attempt:
+                logger.info("%s succeeded on attempt %d", func.__name__, attempt + 1)
             return result
 
         except Exception as e:
@@ -158,8 +232,13 @@ async def retry_with_backoff(
                 )
                 raise
 
-            # Wait before retrying
-            await asyncio.sleep(delay)
+            # Wait before retrying; full jitter keeps concurrent callers from
+            # retrying in lockstep, but never sooner than the server asked
+            wait = random.uniform(0, delay)
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                wait = max(wait, retry_after)
+            await asyncio.sleep(wait)
             delay = min(delay * exponential_base, max_delay)
 
     # Should never reach here
@@ -230,6 +309,10 @@ def should_escalate(error_count: int, max_iterations: int) -> bool:
     return error_count >= max_iterations
 
 
+# Number of errors each ResilientOperation remembers
+ERROR_HISTORY_SIZE = 32
+
+
 class ResilientOperation:
     """
     Wraps an async operation with error handling and recovery.
@@ -257,7 +340,8 @@ class ResilientOperation:
         self.max_retries = max_retries
         self.timeout = timeout
         self.attempt_count = 0
-        self.error_history = []
+        # Only the most recent errors are kept, so memory stays bounded
+        self.error_history: Deque[Tuple[str, str]] = deque(maxlen=ERROR_HISTORY_SIZE)
 
     async def execute(self, *args, **kwargs) -> Any:
         """
@@ -317,35 +401,64 @@ async def partial_recovery(
     items: list,
     processor: Callable,
     fail_on_count: Optional[int] = None,
+    concurrency: Optional[int] = None,
 ) -> tuple[list, list]:
     """
-    Process items with partial failure recovery.
+    Process items concurrently with partial failure recovery.
+
+    Once ``fail_on_count`` items have failed, items still in progress or
+    waiting are cancelled; failures already under way may push the final
+    count slightly past the limit.
 
     Args:
         items: Items to process
         processor: Async function to process each item
         fail_on_count: Max allowed failures before stopping
+        concurrency: Max items processed at once (unlimited if None)
 
     Returns:
-        Tuple of (successful_results, failed_items)
+        Tuple of (successful_results, failed_items), each in item order
     """
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def process(item):
+        if semaphore is None:
+            return await processor(item)
+        async with semaphore:
+            return await processor(item)
+
+    tasks = [asyncio.ensure_future(process(item)) for item in items]
+    failure_count = 0
+
+    def stop_on_failures(task: asyncio.Future):
+        nonlocal failure_count
+        if task.cancelled() or task.exception() is None:
+            return
+        failure_count += 1
+        if fail_on_count and failure_count == fail_on_count:
+            logger.error(f"Stopping after {fail_on_count} failures")
+            for pending in tasks:
+                pending.cancel()
+
+    for task in tasks:
+        task.add_done_callback(stop_on_failures)
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
     successful = []
     failed = []
 
-    for i, item in enumerate(items):
-        try:
-            result = await processor(item)
+    for i, (item, result) in enumerate(zip(items, results)):
+        if isinstance(result, asyncio.CancelledError):
+            continue
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to process item {i}: {str(result)}")
+            failed.append({"item": item, "error": str(result)})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
             successful.append(result)
 
-        except Exception as e:
-            logger.warning(f"Failed to process item {i}: {str(e)}")
-            failed.append({"item": item, "error": str(e)})
-
-            # Stop if too many failures
-            if fail_on_count and len(failed) >= fail_on_count:
-                logger.error(f"Stopping after {fail_on_count} failures")
-                break
-
     logger.info(
         f"Processed {len(successful)} items successfully, "
         f"{len(failed)} failed"
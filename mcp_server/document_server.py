@@ -1,18 +1,27 @@
-import gradio as gr
+import html
 import os
 import json
+import re
+from collections import namedtuple
 from datetime import datetime
+from functools import cache, lru_cache
 from pathlib import Path
-from jinja2 import Template
+from string import Template
 
-from dotenv import load_dotenv
 from utils.logging import setup_logger
 
-load_dotenv()
 logger = setup_logger("document_server", level="DEBUG", log_file="document_server.log")
 
 
-# Citation formatting templates
+@cache
+def _ensure_env() -> None:
+    """Load environment variables from .env once, when the server starts."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+# Citation formatting templates, filled with str.format
 CITATION_FORMATS = {
     "apa": "{author} ({year}). {title}. {source}.",
     "mla": "{author}. \"{title}.\" {source}, {year}.",
@@ -20,6 +29,65 @@ CITATION_FORMATS = {
 }
 
 
+# Page wrapped around format_as_html output, built once at import
+_HTML_SKELETON = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>$title</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 40px; }
+        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        strong { font-weight: bold; }
+        em { font-style: italic; }
+    </style>
+</head>
+<body>
+    <h1>$title</h1>
+    <p>$body</p>
+</body>
+</html>""")
+
+# Bold spans, italic spans and paragraph breaks, matched in one scan by format_as_html
+_INLINE_MARKDOWN_RE = re.compile(
+    r"\*\*(?P<strong>.+?)\*\*"
+    r"|(?<!\*)\*(?!\*)(?P<em>.+?)(?<!\*)\*(?!\*)"
+    r"|\n{2,}"
+)
+
+
+# Markdown heading lines; deeper headings are listed at the second level
+_HEADING_RE = re.compile(r"^(#{1,2})#*(.*)$", re.MULTILINE)
+
+
+def _inline_html(match: "re.Match[str]") -> str:
+    if match.group("strong") is not None:
+        return f"<strong>{match.group('strong')}</strong>"
+    if match.group("em") is not None:
+        return f"<em>{match.group('em')}</em>"
+    return "</p><p>"
+
+
+_TextStats = namedtuple(
+    "TextStats",
+    "word_count char_count paragraph_count sentence_count has_headings has_lists",
+)
+
+
+@lru_cache(maxsize=32)
+def _analyze(content: str) -> _TextStats:
+    """Count the words, paragraphs and sentences of ``content``, once per distinct text."""
+    return _TextStats(
+        word_count=len(content.split()),
+        char_count=len(content),
+        paragraph_count=sum(1 for p in content.split('\n\n') if p and not p.isspace()),
+        sentence_count=sum(1 for s in content.split('.') if s and not s.isspace()),
+        has_headings="#" in content,
+        has_lists="-" in content or "*" in content,
+    )
+
+
 async def format_citation(
     author: str,
     title: str,
@@ -41,9 +109,8 @@ async def format_citation(
         Formatted citation string
     """
     try:
-        template_str = CITATION_FORMATS.get(style.lower(), CITATION_FORMATS["apa"])
-        template = Template(template_str)
-        result = template.render(
+        template = CITATION_FORMATS.get(style.lower(), CITATION_FORMATS["apa"])
+        result = template.format(
             author=author,
             title=title,
             source=source,
@@ -67,12 +134,13 @@ async def validate_document(content: str) -> dict:
         Dictionary with validation results
     """
     try:
+        stats = _analyze(content)
         metrics = {
-            "word_count": len(content.split()),
-            "char_count": len(content),
-            "paragraph_count": len([p for p in content.split('\n\n') if p.strip()]),
-            "has_headings": "##" in content or "#" in content,
-            "has_lists": "-" in content or "*" in content,
+            "word_count": stats.word_count,
+            "char_count": stats.char_count,
+            "paragraph_count": stats.paragraph_count,
+            "has_headings": stats.has_headings,
+            "has_lists": stats.has_lists,
             "is_valid": True,
             "issues": [],
         }
@@ -107,20 +175,10 @@ async def generate_toc(content: str) -> str:
         Table of contents in markdown format
     """
     try:
-        lines = content.split('\n')
-        toc_items = []
-
-        for line in lines:
-            if line.startswith('##'):
-                level = 2
-                title = line.replace('#', '').strip()
-                indent = "  " * (level - 1)
-                toc_items.append(f"{indent}- {title}")
-            elif line.startswith('#'):
-                level = 1
-                title = line.replace('#', '').strip()
-                indent = "  " * (level - 1)
-                toc_items.append(f"{indent}- {title}")
+        toc_items = [
+            f"{'  ' * (len(match.group(1)) - 1)}- {match.group(2).replace('#', '').strip()}"
+            for match in _HEADING_RE.finditer(content)
+        ]
 
         if not toc_items:
             return "No headings found in document"
@@ -150,33 +208,16 @@ async def format_as_html(
         HTML string
     """
     try:
-        # Simple markdown to HTML conversion
-        html_content = content
-        html_content = html_content.replace('\n\n', '</p><p>')
-        html_content = html_content.replace('**', '<strong>', 1).replace('**', '</strong>')
-        html_content = html_content.replace('*', '<em>', 1).replace('*', '</em>')
+        # Simple markdown to HTML conversion in a single pass over the content
+        html_content = _INLINE_MARKDOWN_RE.sub(_inline_html, content)
 
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; margin: 40px; }}
-        h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-        h2 {{ color: #34495e; margin-top: 30px; }}
-        strong {{ font-weight: bold; }}
-        em {{ font-style: italic; }}
-    </style>
-</head>
-<body>
-    <h1>{title}</h1>
-    <p>{html_content}</p>
-</body>
-</html>"""
+        html_page = _HTML_SKELETON.substitute(
+            title=html.escape(title),
+            body=html_content,
+        )
 
         logger.info(f"Document converted to HTML")
-        return html
+        return html_page
     except Exception as e:
         logger.error(f"Error converting to HTML: {str(e)}")
         return f"Error: {str(e)}"
@@ -193,11 +234,12 @@ async def extract_metadata(content: str) -> dict:
         Dictionary with extracted metadata
     """
     try:
+        stats = _analyze(content)
         metadata = {
             "generated_at": datetime.now().isoformat(),
-            "word_count": len(content.split()),
-            "paragraph_count": len([p for p in content.split('\n\n') if p.strip()]),
-            "sentence_count": len([s for s in content.split('.') if s.strip()]),
+            "word_count": stats.word_count,
+            "paragraph_count": stats.paragraph_count,
+            "sentence_count": stats.sentence_count,
             "avg_words_per_paragraph": 0,
         }
 
@@ -213,30 +255,37 @@ async def extract_metadata(content: str) -> dict:
         return {"error": str(e)}
 
 
-with gr.Blocks() as demo:
-    gr.Markdown(
-        """
-        # Document Processing Tools (MCP Server)
+def build_demo():
+    """Build the Gradio app exposing the tools; Gradio is imported only here."""
+    import gradio as gr
 
-        This is a Gradio MCP server providing document processing tools:
-        - Citation formatting (APA, MLA, Chicago)
-        - Document validation
-        - Table of contents generation
-        - HTML conversion
-        - Metadata extraction
-        """
-    )
-    gr.api(
-        format_citation,
-        validate_document,
-        generate_toc,
-        format_as_html,
-        extract_metadata,
-    )
+    with gr.Blocks() as demo:
+        gr.Markdown(
+            """
+            # Document Processing Tools (MCP Server)
+
+            This is a Gradio MCP server providing document processing tools:
+            - Citation formatting (APA, MLA, Chicago)
+            - Document validation
+            - Table of contents generation
+            - HTML conversion
+            - Metadata extraction
+            """
+        )
+        gr.api(
+            format_citation,
+            validate_document,
+            generate_toc,
+            format_as_html,
+            extract_metadata,
+        )
+
+    return demo
 
 
 def start_server():
-    demo.launch(
+    _ensure_env()
+    build_demo().launch(
         mcp_server=True,
         server_name=os.getenv("SERVER_NAME", "127.0.0.1"),
         server_port=int(os.getenv("DOCUMENT_SERVER_PORT", 7861)),
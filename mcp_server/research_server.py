@@ -1,15 +1,89 @@
-import gradio as gr
+import asyncio
 import os
 import json
-from tools.web_search import DuckDuckGoWebSearch, TavilyWebSearch, WebScraper
-from tools.literature_tools import LiteratureTools
-from dotenv import load_dotenv
+import time
+from collections import OrderedDict
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Tuple
 from utils.logging import setup_logger
 
+if TYPE_CHECKING:
+    # Search clients are imported on first use; their SDKs are slow to import
+    from tools.web_search import DuckDuckGoWebSearch, TavilyWebSearch, WebScraper
+
 # Initialize logging for this module
 logger = setup_logger("research_server", level="DEBUG", log_file="research_server.log")
 
-load_dotenv()
+
+@cache
+def _ensure_env() -> None:
+    """Load .env once, on the first API key lookup or at server start."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+# Compact JSON for search results returned to MCP clients
+_json_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+# Clients are built on first use and shared by every request, so their
+# HTTP sessions and connection pools are reused instead of rebuilt per call
+@lru_cache(maxsize=1)
+def _scraper() -> "WebScraper":
+    from tools.web_search import WebScraper
+
+    return WebScraper()
+
+
+@lru_cache(maxsize=1)
+def _ddg() -> "DuckDuckGoWebSearch":
+    from tools.web_search import DuckDuckGoWebSearch
+
+    return DuckDuckGoWebSearch()
+
+
+@lru_cache(maxsize=1)
+def _tavily(api_key: str) -> "TavilyWebSearch":
+    from tools.web_search import TavilyWebSearch
+
+    return TavilyWebSearch(api_key)
+
+
+# Scraped pages are reused for repeat requests of the same URL within the TTL
+SCRAPE_CACHE_SIZE = 256
+SCRAPE_CACHE_TTL_SECONDS = 900
+
+# URL -> (time fetched, fetch task); a pending task is shared by concurrent callers
+_scrape_cache: "OrderedDict[str, Tuple[float, asyncio.Future]]" = OrderedDict()
+
+
+async def _scrape_cached(url: str) -> "str | Exception":
+    """Scrape ``url``, reusing a recent or in-flight fetch of the same URL."""
+    now = time.monotonic()
+    entry = _scrape_cache.get(url)
+    if entry is None or now - entry[0] >= SCRAPE_CACHE_TTL_SECONDS:
+        entry = (now, asyncio.ensure_future(_scraper().scrape_website(url)))
+        _scrape_cache[url] = entry
+        while len(_scrape_cache) > SCRAPE_CACHE_SIZE:
+            _scrape_cache.popitem(last=False)
+    _scrape_cache.move_to_end(url)
+
+    try:
+        # Shielded so one cancelled caller does not cancel the fetch for the others
+        content = await asyncio.shield(entry[1])
+    except Exception:
+        _evict(url, entry)
+        raise
+    if isinstance(content, Exception):
+        _evict(url, entry)
+    return content
+
+
+def _evict(url: str, entry: Tuple[float, asyncio.Future]) -> None:
+    """Drop a failed fetch so the next request for ``url`` retries it."""
+    if _scrape_cache.get(url) is entry:
+        del _scrape_cache[url]
 
 
 async def scrape(url: str) -> str:
@@ -23,8 +97,7 @@ async def scrape(url: str) -> str:
         str: The scraped content of the website.
     """
     try:
-        scraper = WebScraper()
-        content = await scraper.scrape_website(url)
+        content = await _scrape_cached(url)
         if isinstance(content, Exception):
             return f"Error scraping website: {str(content)}"
         logger.info(f"Successfully scraped {url}")
@@ -46,10 +119,9 @@ async def ddg_search(query: str, max_results: int = 5) -> str:
         str: The search results in JSON format.
     """
     try:
-        search_engine = DuckDuckGoWebSearch()
-        results = await search_engine.search(query, max_results=max_results)
+        results = await _ddg().search(query, max_results=max_results)
         logger.info(f"DuckDuckGo search completed for: {query}")
-        return json.dumps(results) if isinstance(results, dict) else str(results)
+        return _json_dumps(results) if isinstance(results, dict) else str(results)
     except Exception as e:
         logger.error(f"Error during DuckDuckGo search: {str(e)}")
         return f"Error during web search: {str(e)}"
@@ -67,14 +139,14 @@ async def tavily_search(query: str, max_results: int = 5) -> str:
         str: The search results in JSON format.
     """
     try:
+        _ensure_env()
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             return "Error: TAVILY_API_KEY not set"
 
-        search_engine = TavilyWebSearch(api_key)
-        results = await search_engine.search(query, max_results=max_results)
+        results = await _tavily(api_key).search(query, max_results=max_results)
         logger.info(f"Tavily search completed for: {query}")
-        return json.dumps(results) if isinstance(results, list) else str(results)
+        return _json_dumps(results) if isinstance(results, list) else str(results)
     except Exception as e:
         logger.error(f"Error during Tavily search: {str(e)}")
         return f"Error during web search: {str(e)}"
@@ -92,14 +164,17 @@ async def scholar_search(query: str, max_results: int = 5) -> str:
         str: The search results in JSON format.
     """
     try:
+        _ensure_env()
         api_key = os.getenv("SERPAPI_API_KEY")
         if not api_key:
             return "Error: SERPAPI_API_KEY not set"
 
+        from tools.literature_tools import LiteratureTools
+
         lit_tools = LiteratureTools(api_key)
         results = await lit_tools.search_google_scholar(query, max_results=max_results)
         logger.info(f"Scholar search completed for: {query}")
-        return json.dumps(results) if isinstance(results, dict) else str(results)
+        return _json_dumps(results) if isinstance(results, dict) else str(results)
     except Exception as e:
         logger.error(f"Error during Scholar search: {str(e)}")
         return f"Error during scholar search: {str(e)}"
@@ -117,10 +192,12 @@ async def arxiv_search(query: str, max_results: int = 5) -> str:
         str: The search results in JSON format.
     """
     try:
+        from tools.literature_tools import LiteratureTools
+
         lit_tools = LiteratureTools()
         results = await lit_tools.search_arxiv(query, max_results=max_results)
         logger.info(f"arXiv search completed for: {query}")
-        return json.dumps(results) if isinstance(results, dict) else str(results)
+        return _json_dumps(results) if isinstance(results, dict) else str(results)
     except Exception as e:
         logger.error(f"Error during arXiv search: {str(e)}")
         return f"Error during arXiv search: {str(e)}"
@@ -138,40 +215,91 @@ async def semantic_scholar_search(query: str, max_results: int = 5) -> str:
         str: The search results in JSON format.
     """
     try:
+        from tools.literature_tools import LiteratureTools
+
         lit_tools = LiteratureTools()
         results = await lit_tools.search_semantic_scholar(query, max_results=max_results)
         logger.info(f"Semantic Scholar search completed for: {query}")
-        return json.dumps(results) if isinstance(results, dict) else str(results)
+        return _json_dumps(results) if isinstance(results, dict) else str(results)
     except Exception as e:
         logger.error(f"Error during Semantic Scholar search: {str(e)}")
         return f"Error during Semantic Scholar search: {str(e)}"
 
 
-with gr.Blocks() as demo:
-    gr.Markdown(
-        """
-        # Research Tools (MCP Server)
+# Search handlers available to multi_search, by provider name
+SEARCH_PROVIDERS = {
+    "ddg": ddg_search,
+    "tavily": tavily_search,
+    "scholar": scholar_search,
+    "arxiv": arxiv_search,
+    "semantic_scholar": semantic_scholar_search,
+}
 
-        This is a Gradio MCP server providing research and data gathering tools:
-        - Web search (DuckDuckGo, Tavily)
-        - Academic search (Google Scholar, arXiv, Semantic Scholar)
-        - Web scraping
 
-        All tools are available via MCP protocol.
-        """
-    )
-    gr.api(
-        scrape,
-        ddg_search,
-        tavily_search,
-        scholar_search,
-        arxiv_search,
-        semantic_scholar_search,
+async def multi_search(query: str, providers: list[str], max_results: int = 5) -> str:
+    """
+    Search several providers at once.
+
+    The searches run concurrently, so the call takes about as long as the
+    slowest provider rather than the sum of all of them.
+
+    Args:
+        query (str): The search query.
+        providers (list[str]): Providers to search: ddg, tavily, scholar, arxiv, semantic_scholar.
+        max_results (int): Maximum number of results to return per provider.
+
+    Returns:
+        str: JSON object mapping each provider to its search results.
+    """
+    unknown = [p for p in providers if p not in SEARCH_PROVIDERS]
+    if unknown:
+        return f"Error: unknown search providers: {', '.join(unknown)}"
+
+    results = await asyncio.gather(
+        *(SEARCH_PROVIDERS[p](query, max_results=max_results) for p in providers),
+        return_exceptions=True,
     )
+    logger.info(f"Multi-provider search completed for: {query}")
+    return _json_dumps({
+        provider: f"Error during search: {result}" if isinstance(result, Exception) else result
+        for provider, result in zip(providers, results)
+    })
+
+
+def build_demo():
+    """Build the Gradio app exposing the tools; Gradio is imported only here."""
+    import gradio as gr
+
+    with gr.Blocks() as demo:
+        gr.Markdown(
+            """
+            # Research Tools (MCP Server)
+
+            This is a Gradio MCP server providing research and data gathering tools:
+            - Web search (DuckDuckGo, Tavily)
+            - Academic search (Google Scholar, arXiv, Semantic Scholar)
+            - Web scraping
+            - Combined search across several providers at once
+
+            All tools are available via MCP protocol.
+            """
+        )
+        gr.api(
+            scrape,
+            ddg_search,
+            tavily_search,
+            scholar_search,
+            arxiv_search,
+            semantic_scholar_search,
+            multi_search,
+        )
+
+    return demo
 
 
 def start_server():
-    demo.launch(
+    _ensure_env()
+    build_demo().launch(
         mcp_server=True,
         server_name=os.getenv("SERVER_NAME", "127.0.0.1"),
         server_port=int(os.getenv("RESEARCH_SERVER_PORT", 7860)),
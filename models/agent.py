@@ -1,63 +1,177 @@
-from dataclasses import dataclass, field
-from typing import List, Union, Callable, Any
+import hashlib
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Literal, Optional, Tuple, Union, Callable, Any
 from utils.config import Config, load_config
-from llama_index.llms.openai import OpenAI
-from llama_index.core.agent.workflow import FunctionAgent
-from llama_index.core.tools.types import BaseTool
+from utils.http import get_shared_async_client
 from abc import ABC
 from utils.logging import setup_logger
 
+if TYPE_CHECKING:
+    # llama_index is imported lazily at build time; its import graph is large.
+    from llama_index.llms.openai import OpenAI
+    from llama_index.core.agent.workflow import FunctionAgent
+    from llama_index.core.tools.types import BaseTool
+
 # Initialize logging for this module
 logger = setup_logger("agent", level="DEBUG", log_file="agent.log")
 
-@dataclass
+
+@cache
+def _ensure_env() -> None:
+    """Load environment variables from .env once, on first agent build."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+LlmTier = Literal["nano", "mini", "full"]
+
+
+@lru_cache(maxsize=32)
+def _llm_client(
+    api_key: str,
+    model: str,
+    temperature: float,
+    prompt_cache_key: Optional[str] = None,
+) -> "OpenAI":
+    """Return the LLM client for an API key, model, temperature and prompt cache key.
+
+    Requests sent with the same ``prompt_cache_key`` are routed so OpenAI can
+    reuse the cached prefix of a static system prompt. All clients share one
+    async connection pool so agents reuse TLS sessions. A client is handed to
+    every agent and thread that asks for the same arguments, which is safe as
+    agents only issue requests through it and never change its settings.
+    """
+    from llama_index.llms.openai import OpenAI
+
+    return OpenAI(
+        api_key=api_key,
+        model=model,
+        temperature=temperature,
+        additional_kwargs=(
+            {"extra_body": {"prompt_cache_key": prompt_cache_key}} if prompt_cache_key else {}
+        ),
+        async_http_client=get_shared_async_client(),
+    )
+
+
+def _llm_server(
+    api_key: str,
+    config_path: str,
+    llm_tier: Optional[LlmTier] = None,
+    prompt_cache_key: Optional[str] = None,
+) -> "OpenAI":
+    """Return the shared LLM client for the model a config and tier resolve to.
+
+    Agents without a tier use the config's default model. The client samples
+    at the config's temperature.
+    """
+    config: Config = load_config(config_path)
+    model = config.model_tiers[llm_tier] if llm_tier else config.model
+    return _llm_client(api_key, model, config.temperature, prompt_cache_key)
+
+
+# Fields every agent config must set, with the name used in the error message
+_REQUIRED: Tuple[Tuple[str, str], ...] = (
+    ("name", "Agent name"),
+    ("description", "Agent description"),
+    ("system_prompt", "System prompt"),
+    ("llm", "LLM"),
+)
+
+_LLM_TIERS = frozenset({None, "nano", "mini", "full"})
+
+# Built FunctionAgents keyed by (agent name, API key digest, config path)
+_AGENT_CACHE: Dict[Tuple[str, bytes, str], "FunctionAgent"] = {}
+
+# Resolved tools keyed by (agent class, tool names), shared by all instances of a class
+_RESOLVED_TOOLS: Dict[Tuple[type, Tuple[str, ...]], List[Union["BaseTool", Callable[..., Any]]]] = {}
+
+
+@dataclass(slots=True, frozen=True)
 class _AgentConfig:
     name: str
     description: str
     system_prompt: str
     llm: str
-    tools: List[str] | None = field(default_factory=list)
-    can_handoff_to: List[str] | None = field(default_factory=list)
+    tools: tuple[str, ...] = ()
+    can_handoff_to: frozenset[str] = frozenset()
+    llm_tier: Optional[LlmTier] = None
 
     def __post_init__(self):
-        if not self.name:
-            raise ValueError("Agent name is required.")
-        if not self.description:
-            raise ValueError("Agent description is required.")
-        if not self.system_prompt:
-            raise ValueError("System prompt is required.")
-        if not self.llm:
-            raise ValueError("LLM is required.")
-        if not isinstance(self.tools, list):
-            raise TypeError("Tools must be a list.")
-        if not isinstance(self.can_handoff_to, list):
-            raise TypeError("can_handoff_to must be a list.")
+        for attr, label in _REQUIRED:
+            if not getattr(self, attr):
+                raise ValueError(f"{label} is required.")
+        if self.llm_tier not in _LLM_TIERS:
+            raise ValueError(f"Unknown LLM tier: {self.llm_tier}")
+        if isinstance(self.tools, str) or isinstance(self.can_handoff_to, str):
+            raise TypeError("tools and can_handoff_to must be collections of names.")
+        # Normalise once so membership checks are O(1) and the config stays hashable
+        object.__setattr__(self, "tools", tuple(self.tools or ()))
+        object.__setattr__(self, "can_handoff_to", frozenset(self.can_handoff_to or ()))
+
+    def can_handoff(self, agent_name: str) -> bool:
+        """Return True if this agent may hand off control to ``agent_name``."""
+        return agent_name in self.can_handoff_to
 
 class Agent(_AgentConfig, ABC):
     """Base class for agents with common properties and methods."""
+
+    __slots__ = ()
+
+    # Subclasses set this to False to build without their declared tools
+    USE_TOOLS: ClassVar[bool] = True
     
-    def _get_llm_server(self, api_key: str, config_path: str) -> OpenAI:
+    def _get_llm_server(self, api_key: str, config_path: str) -> "OpenAI":
         """Initializes the LLM server with the provided API key and model."""
         if not api_key:
             raise ValueError("API key is required for the LLM server.")
-        config: Config = load_config(config_path)
-        model = config.model
-        return OpenAI(api_key=api_key, model=model)
+        # Key the provider's prompt cache on the agent, whose system prompt never changes
+        return _llm_server(api_key, config_path, self.llm_tier, prompt_cache_key=self.name)
     
-    def _resolve_tools(self, tool_names: List[str]) -> List[Union[BaseTool, Callable[..., Any]]]:
+    def _resolve_tools(self, tool_names: List[str]) -> List[Union["BaseTool", Callable[..., Any]]]:
         """Resolve tool names to actual tool instances. Override in subclasses."""
         # Base implementation returns empty list - subclasses should override
         return []
+
+    def _tools_for_build(self) -> List[Union["BaseTool", Callable[..., Any]]]:
+        """Return this agent's resolved tools, resolving each class's tool names only once."""
+        key = (type(self), self.tools)
+        resolved = _RESOLVED_TOOLS.get(key)
+        if resolved is None:
+            resolved = _RESOLVED_TOOLS[key] = self._resolve_tools(list(self.tools))
+        return list(resolved)
     
-    def build_agent(self, api_key: str, config_path: str) -> FunctionAgent:
-        """Builds the agent with the provided parameters."""
+    def build_agent(self, api_key: str, config_path: str) -> "FunctionAgent":
+        """Builds the agent with the provided parameters.
+
+        Built agents are cached per (name, API key, config path), so later calls
+        return the existing FunctionAgent instead of rebuilding it.
+        """
+        from llama_index.core.agent.workflow import FunctionAgent
+
+        key = (
+            self.name,
+            hashlib.blake2b((api_key or "").encode(), digest_size=16).digest(),
+            config_path,
+        )
+        cached = _AGENT_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        _ensure_env()
         logger.info(f"Building {self.name} with LLM {self.llm}")
-        resolved_tools = self._resolve_tools(self.tools or [])
-        return FunctionAgent(
+        resolved_tools = (
+            self._tools_for_build() if self.USE_TOOLS and self.tools else []
+        )
+        agent = FunctionAgent(
             name=self.name,
             description=self.description,
             system_prompt=self.system_prompt,
             llm=self._get_llm_server(api_key=api_key, config_path=config_path),
             tools=resolved_tools,
-            can_handoff_to=self.can_handoff_to
-        )
\ No newline at end of file
+            can_handoff_to=sorted(self.can_handoff_to)
+        )
+        _AGENT_CACHE[key] = agent
+        return agent
\ No newline at end of file
@@ -41,6 +41,11 @@ Examples:
         default="output",
         help="Output directory for results (default: output)",
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Run short topics as a single LLM call without plan approval",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -50,6 +55,12 @@ Examples:
 
     args = parser.parse_args()
 
+    # Resolve the config once and fail before prompting if it is missing
+    config_path = Path(args.config).resolve()
+    if not config_path.is_file():
+        print(f"Error: Configuration file not found: {config_path}")
+        return 1
+
     # If no prompt provided, show interactive mode
     if not args.prompt:
         print("=" * 80)
@@ -76,7 +87,7 @@ Examples:
     print("=" * 80)
 
     try:
-        workflow = DeepResearchWorkflow(config_path=args.config)
+        workflow = DeepResearchWorkflow(config_path=str(config_path), fast_path=args.fast)
     except FileNotFoundError as e:
         print(f"Error: Configuration file not found: {e}")
         print("Make sure to create a .env file with required API keys.")
@@ -1,17 +1,16 @@
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.config import load_config
 import pytest
-import sys
-import os
+from pathlib import Path
+
+TEST_CONFIG_PATH = Path(__file__).resolve().parent / ".test_config" / "test_config.yaml"
+
 
 @pytest.fixture
 def config():
     """Fixture to load the configuration."""
-    config_path = os.path.join(os.path.dirname(__file__), '.test_config/test_config.yaml')
-    assert os.path.exists(config_path), f"Config file not found at {config_path}"
-    return load_config(config_path)
+    assert TEST_CONFIG_PATH.exists(), f"Config file not found at {TEST_CONFIG_PATH}"
+    return load_config(str(TEST_CONFIG_PATH))
+
 
 def test_load_config(config):
     """Test that the configuration is loaded correctly."""
@@ -27,4 +26,18 @@ def test_load_config(config):
     assert config.max_context_length == 16000
     assert config.mcp_enabled is True
     assert config.host == "127.0.0.1"
-    assert config.port == 7860
\ No newline at end of file
+    assert config.port == 7860
+
+
+def test_model_tiers_default(config):
+    """Test that model tiers fall back to the defaults when not configured."""
+    assert config.model_tiers == {
+        "nano": "gpt-4.1-nano",
+        "mini": "gpt-4.1-mini",
+        "full": "gpt-4.1",
+    }
+
+
+def test_load_config_is_cached():
+    """Test that an unchanged config file is parsed only once."""
+    assert load_config(str(TEST_CONFIG_PATH)) is load_config(str(TEST_CONFIG_PATH))
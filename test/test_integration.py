@@ -14,13 +14,28 @@ import pytest
 import asyncio
 import json
 import tempfile
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
 from deepresearch import DeepResearchWorkflow, WorkflowState
 from agents.deep_agents import PlanningAgent, ResearchAgent, WriteAgent
 from tools.registry import ToolRegistry
-from utils.config import load_config
+from utils.config import Config, load_config
+
+
+@pytest.fixture
+def workflow_deps(monkeypatch):
+    """Stub the workflow's tool registry and config so it builds without API keys."""
+    import deepresearch
+
+    config = Config(
+        model="default-model",
+        model_tiers={"nano": "nano-model", "mini": "mini-model", "full": "full-model"},
+    )
+    monkeypatch.setattr(deepresearch, "ToolRegistry", Mock)
+    monkeypatch.setattr(deepresearch, "load_config", lambda path: config)
+    return config
 
 
 class TestWorkflowState:
@@ -70,6 +85,18 @@ class TestWorkflowState:
             assert loaded_data["user_prompt"] == "Save test"
             assert loaded_data["draft_report"] == "Test report"
 
+    def test_large_state_fields_are_spilled_to_files(self, tmp_path):
+        """Test large report fields are saved beside the state JSON."""
+        state = WorkflowState("test_spill")
+        state.draft_report = "x" * 10000
+
+        state_file = state.save(tmp_path)
+        loaded_data = json.loads(state_file.read_text())
+
+        ref = loaded_data["draft_report"]["$ref"]
+        assert (tmp_path / ref).read_text() == state.draft_report
+        assert loaded_data["formatted_report"] == ""
+
 
 class TestAgentInitialization:
     """Test agent classes initialize correctly."""
@@ -127,6 +154,319 @@ class TestAgentInitialization:
             assert len(agent.system_prompt) > 0
             assert agent.name
 
+    @pytest.mark.asyncio
+    async def test_build_agents_preserves_order(self):
+        """Test concurrent builds return agents in input order."""
+        from agents.registry import build_agents
+
+        agents = [Mock(), Mock()]
+        agents[0].build_agent.return_value = "first"
+        agents[1].build_agent.return_value = "second"
+
+        built = await build_agents(agents, "key", "config.yaml")
+
+        assert built == ["first", "second"]
+        agents[0].build_agent.assert_called_once_with("key", "config.yaml")
+
+
+class TestWorkflowDag:
+    """Test dependency-driven stage scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_run_dag_respects_dependencies(self):
+        """Test every stage sees the results of its dependencies."""
+        from agents.deep_agents import WORKFLOW_DAG
+        from agents.scheduler import run_dag
+
+        async def run(stage, deps):
+            assert set(deps) == set(WORKFLOW_DAG[stage])
+            return stage
+
+        results = await run_dag(WORKFLOW_DAG, run)
+
+        assert set(results) == set(WORKFLOW_DAG)
+
+    @pytest.mark.asyncio
+    async def test_run_dag_overlaps_independent_stages(self):
+        """Test stages sharing a dependency run concurrently."""
+        from agents.scheduler import run_dag
+
+        running = set()
+        overlapped = []
+
+        async def run(stage, deps):
+            running.add(stage)
+            await asyncio.sleep(0.01)
+            overlapped.append(len(running))
+            running.discard(stage)
+            return stage
+
+        dag = {"revision": (), "formatting": ("revision",), "summary": ("revision",)}
+        await run_dag(dag, run)
+
+        assert max(overlapped) == 2
+
+    @pytest.mark.asyncio
+    async def test_run_dag_rejects_cycles(self):
+        """Test cyclic graphs raise ValueError."""
+        from agents.scheduler import run_dag
+
+        async def run(stage, deps):
+            return stage
+
+        with pytest.raises(ValueError):
+            await run_dag({"a": ("b",), "b": ("a",)}, run)
+
+
+class TestAgentResponseCache:
+    """Test the agent response caches."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_runs_are_cached(self, tmp_path, monkeypatch):
+        """Test a temperature-0 prompt only reaches the agent once."""
+        from agents import cache
+
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+        agent = Mock(system_prompt="prompt", llm=Mock(model="gpt-4.1-mini"))
+        agent.run = AsyncMock(return_value="answer")
+
+        first = await cache.cached_run(agent, "topic", temperature=0)
+        second = await cache.cached_run(agent, "topic", temperature=0)
+
+        assert first == second == "answer"
+        agent.run.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sampled_runs_bypass_cache(self, tmp_path, monkeypatch):
+        """Test non-zero temperature runs are never served from cache."""
+        from agents import cache
+
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+        agent = Mock(system_prompt="prompt", llm=Mock(model="gpt-4.1-mini"))
+        agent.run = AsyncMock(return_value="answer")
+
+        await cache.cached_run(agent, "topic", temperature=0.7)
+        await cache.cached_run(agent, "topic", temperature=0.7)
+
+        assert agent.run.await_count == 2
+
+    def test_response_cache_key_covers_tools(self):
+        """Test agents with different tools never share a cached response."""
+        from agents.cache import response_cache_key
+
+        plain = response_cache_key("prompt", "gpt-4.1-mini", "topic", 0)
+        with_tools = response_cache_key(
+            "prompt", "gpt-4.1-mini", "topic", 0, ("get_planning_template",)
+        )
+
+        assert plain != with_tools
+
+    @pytest.mark.asyncio
+    async def test_identical_llm_requests_are_cached(self, tmp_path, monkeypatch):
+        """Test a repeated messages.create request only reaches the client once."""
+        from utils import llm_cache
+
+        monkeypatch.setattr(llm_cache, "LLM_CACHE_DIR", tmp_path)
+        client = Mock()
+        client.messages.create = AsyncMock(return_value=Mock(content=[Mock(text="answer")]))
+        request = {"model": "claude", "max_tokens": 10, "messages": [{"role": "user", "content": "hi"}]}
+
+        first = await llm_cache.cached_create(client, **request)
+        second = await llm_cache.cached_create(client, **request)
+
+        assert first == second == "answer"
+        client.messages.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_workflow_caches_only_selected_stages(
+        self, tmp_path, monkeypatch, workflow_deps
+    ):
+        """Test planning and research always call the model and the cache can be switched off."""
+        import deepresearch
+        from utils import llm_cache
+
+        monkeypatch.setattr(llm_cache, "LLM_CACHE_DIR", tmp_path)
+        # Send research through messages.create rather than streaming
+        monkeypatch.setitem(
+            deepresearch._STAGE_REQUESTS, "research", ("{user_prompt}\n{plan}", False)
+        )
+        workflow = DeepResearchWorkflow()
+        workflow.client = Mock()
+        workflow.client.messages.create = AsyncMock(
+            return_value=Mock(content=[Mock(text="answer")])
+        )
+
+        await workflow._fact_check("report")
+        await workflow._fact_check("report")
+        assert workflow.client.messages.create.await_count == 1
+
+        await workflow._generate_plan("topic")
+        await workflow._generate_plan("topic")
+        await workflow._execute_research("topic", "plan")
+        await workflow._execute_research("topic", "plan")
+        assert workflow.client.messages.create.await_count == 5
+
+        workflow.cache_responses = False
+        await workflow._fact_check("report")
+        assert workflow.client.messages.create.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_built_agents_run_through_response_cache(self, tmp_path, monkeypatch):
+        """Test agents from AGENTS serve repeated deterministic prompts from cache."""
+        from agents import cache, registry
+
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(registry, "_WRAPPED", {})
+        monkeypatch.setattr(registry, "load_config", lambda path: Mock(temperature=0))
+        inner = Mock(system_prompt="prompt", llm=Mock(model="gpt-4.1-mini"))
+        inner.name = "PlanningAgent"
+        inner.run = AsyncMock(return_value="plan")
+        monkeypatch.setattr(
+            registry.RegisteredAgent, "build_agent", lambda self, api_key, config_path: inner
+        )
+
+        agent = registry.build(registry.AGENT_SPECS["planning"], "key", "config.yaml")
+        first = await agent.run("topic")
+        second = await agent.run("topic")
+
+        assert first == second == "plan"
+        assert agent.system_prompt == "prompt"
+        inner.run.assert_awaited_once()
+
+    def test_similarity_cache_matches_near_duplicates(self):
+        """Test near-identical inputs hit and unrelated inputs miss."""
+        from agents.cache import SimilarityCache
+
+        cache = SimilarityCache()
+        draft = "Quantum computing threatens current public key cryptography. " * 20
+        cache.put(draft, "feedback")
+
+        assert cache.get(draft + " Minor edit.") == "feedback"
+        assert cache.get("A history of the printing press.") is None
+
+    @pytest.mark.asyncio
+    async def test_first_review_bypasses_similarity_cache(self):
+        """Test the first review iteration always reaches the reviewer."""
+        from agents.cache import SimilarityCache, deduplicated_run
+
+        review = AsyncMock(return_value="feedback")
+        cache = SimilarityCache()
+
+        await deduplicated_run(review, "draft", cache, iteration=0)
+        await deduplicated_run(review, "draft", cache, iteration=0)
+
+        assert review.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_review_loop_reuses_feedback_for_unchanged_report(
+        self, workflow_deps
+    ):
+        """Test a revision that barely changes the report skips a fresh review."""
+        draft = "Quantum computing threatens current public key cryptography. " * 20
+        workflow = DeepResearchWorkflow()
+        workflow.max_iterations = 3
+        workflow._review = AsyncMock(return_value="Tighten the introduction.")
+        workflow._get_user_approval = AsyncMock(return_value=True)
+        workflow.client = Mock()
+        workflow.client.messages.create = AsyncMock(
+            return_value=Mock(content=[Mock(text=draft + " Minor edit.")])
+        )
+
+        result = await workflow._review_and_revise(draft, WorkflowState("test"))
+
+        assert result == draft + " Minor edit."
+        assert workflow._review.await_count == 1
+        assert workflow.client.messages.create.await_count == 3
+
+
+class TestBatchProcessor:
+    """Test micro-batching of concurrent agent requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        """Test requests within the window are handled by one call, in order."""
+        from agents.batcher import BatchProcessor
+
+        batches = []
+
+        async def handler(items):
+            batches.append(items)
+            return [item.upper() for item in items]
+
+        processor = BatchProcessor(handler, max_batch=8, window_ms=10)
+        results = await asyncio.gather(*(processor.submit(x) for x in ["a", "b", "c"]))
+
+        assert results == ["A", "B", "C"]
+        assert batches == [["a", "b", "c"]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self):
+        """Test a batch is sent once max_batch requests are pending."""
+        from agents.batcher import BatchProcessor
+
+        batches = []
+
+        async def handler(items):
+            batches.append(items)
+            return items
+
+        processor = BatchProcessor(handler, max_batch=2, window_ms=10)
+        await asyncio.gather(*(processor.submit(x) for x in ["a", "b", "c"]))
+
+        assert batches == [["a", "b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_running_batches_are_held_until_done(self):
+        """Test a flushed batch keeps a task reference until it completes."""
+        from agents.batcher import BatchProcessor
+
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(items):
+            started.set()
+            await release.wait()
+            return items
+
+        processor = BatchProcessor(handler, max_batch=1, window_ms=10)
+        pending = asyncio.ensure_future(processor.submit("a"))
+        await started.wait()
+        assert len(processor._running) == 1
+
+        release.set()
+        assert await pending == "a"
+        await asyncio.sleep(0)
+        assert not processor._running
+
+    @pytest.mark.asyncio
+    async def test_built_summary_agent_batches_concurrent_runs(self, tmp_path, monkeypatch):
+        """Test concurrent runs of the built SummaryAgent share one LLM call."""
+        from agents import cache, registry
+
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(registry, "_WRAPPED", {})
+        monkeypatch.setattr(registry, "load_config", lambda path: Mock(temperature=0))
+        inner = Mock(system_prompt="prompt", llm=Mock(model="gpt-4.1-mini"))
+        inner.name = "SummaryAgent"
+        inner.run = AsyncMock(return_value="summary")
+        inner.llm.achat = AsyncMock(
+            return_value=Mock(
+                message=Mock(content=json.dumps({"responses": ["first", "second"]}))
+            )
+        )
+        monkeypatch.setattr(
+            registry.RegisteredAgent, "build_agent", lambda self, api_key, config_path: inner
+        )
+
+        agent = registry.build(registry.AGENT_SPECS["summary"], "key", "config.yaml")
+        results = await asyncio.gather(
+            agent.run("Report on solar power."), agent.run("Report on tidal energy.")
+        )
+
+        assert results == ["first", "second"]
+        inner.llm.achat.assert_awaited_once()
+        inner.run.assert_not_awaited()
+
 
 class TestToolRegistry:
     """Test ToolRegistry functionality."""
@@ -165,7 +505,7 @@ class TestConfiguration:
 
             assert config is not None
             assert hasattr(config, "provider")
-            assert hasattr(config.provider, "model")
+            assert hasattr(config, "model")
         except FileNotFoundError:
             pytest.skip("Config file not found")
 
@@ -174,7 +514,7 @@ class TestConfiguration:
         try:
             config = load_config(".config/config.yaml")
 
-            assert config.provider.model in [
+            assert config.model in [
                 "gpt-4.1-mini",
                 "gpt-4-turbo",
                 "gpt-3.5-turbo",
@@ -226,6 +566,26 @@ class TestDocumentGeneration:
             assert "Test Report" in content
             assert "Test Summary" in content
 
+    def test_html_matches_template(self, tmp_path, monkeypatch, workflow_deps):
+        """Test the page written in pieces equals the filled-in template."""
+        import deepresearch
+
+        monkeypatch.setattr(deepresearch, "HTML", None)
+        workflow = DeepResearchWorkflow()
+        workflow.output_dir = tmp_path
+        generated_at = datetime(2024, 1, 2, 3, 4, 5)
+        report = "<p>Braces {stay} as written</p>"
+
+        html_path = asyncio.run(
+            workflow._create_final_document(report, "Summary", generated_at)
+        )
+
+        assert Path(html_path).read_text(encoding="utf-8") == deepresearch._HTML_TEMPLATE.format(
+            generated_at="2024-01-02 03:04:05",
+            summary="Summary",
+            formatted_report=report,
+        )
+
 
 class TestWorkflowIntegration:
     """Integration tests for workflow execution."""
@@ -250,15 +610,20 @@ class TestWorkflowIntegration:
                 assert workflow.summary_agent is not None
 
     @pytest.mark.asyncio
-    async def test_workflow_plan_generation(self):
+    async def test_workflow_plan_generation(self, tmp_path, monkeypatch):
         """Test planning stage can generate a plan."""
+        from utils import llm_cache
+
+        monkeypatch.setattr(llm_cache, "LLM_CACHE_DIR", tmp_path)
         with patch("utils.config.load_config") as mock_config:
             mock_config.return_value = Mock(
                 provider=Mock(model="gpt-4.1-mini"),
                 mcp_enabled=False,
             )
 
-            with patch("anthropic.Anthropic.messages.create") as mock_create:
+            with patch(
+                "anthropic.AsyncAnthropic.messages.create", new_callable=AsyncMock
+            ) as mock_create:
                 mock_create.return_value = Mock(
                     content=[Mock(text="1. Step one\n2. Step two")]
                 )
@@ -270,6 +635,89 @@ class TestWorkflowIntegration:
                 assert len(plan) > 0
                 assert "Step" in plan
 
+    def test_workflow_resolves_stage_models(self, workflow_deps):
+        """Test stages use config.model, with summary and formatting on a cheaper tier."""
+        workflow = DeepResearchWorkflow()
+
+        assert workflow._agent_cfg["research"]["model"] == "default-model"
+        assert workflow._agent_cfg["planning"]["model"] == "default-model"
+        assert workflow._agent_cfg["formatting"]["model"] == "nano-model"
+        assert workflow._agent_cfg["summary"]["model"] == "nano-model"
+
+    @pytest.mark.asyncio
+    async def test_execute_runs_stages_from_workflow_dag(self, tmp_path, workflow_deps):
+        """Test execute feeds each stage the results of its WORKFLOW_DAG dependencies."""
+        workflow = DeepResearchWorkflow()
+        workflow.output_dir = tmp_path
+        workflow._generate_plan = AsyncMock(return_value="plan")
+        workflow._get_user_approval = AsyncMock(return_value=True)
+        workflow._execute_research = AsyncMock(return_value="notes")
+        workflow._write_report = AsyncMock(return_value="draft")
+        workflow._review_and_revise = AsyncMock(return_value="revised")
+        workflow._fact_check = AsyncMock(return_value="checked")
+        workflow._format_document = AsyncMock(return_value="formatted")
+        workflow._generate_summary = AsyncMock(return_value="summary")
+        workflow._create_final_document = AsyncMock(return_value="report.html")
+
+        result = await workflow.execute("Test topic")
+
+        assert result["status"] == "success"
+        assert result["summary"] == "summary"
+        workflow._write_report.assert_awaited_once_with("Test topic", "notes")
+        workflow._format_document.assert_awaited_once_with("revised")
+        workflow._generate_summary.assert_awaited_once_with("formatted")
+
+    @pytest.mark.asyncio
+    async def test_execute_cancels_on_rejected_plan(self, tmp_path, workflow_deps):
+        """Test a rejected plan cancels the workflow before research starts."""
+        workflow = DeepResearchWorkflow()
+        workflow.output_dir = tmp_path
+        workflow._generate_plan = AsyncMock(return_value="plan")
+        workflow._get_user_approval = AsyncMock(return_value=False)
+        workflow._execute_research = AsyncMock(return_value="notes")
+
+        result = await workflow.execute("Test topic")
+
+        assert result["status"] == "cancelled"
+        workflow._execute_research.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_fast_path_needs_openai_key(self, tmp_path, monkeypatch, workflow_deps):
+        """Test the compiled fast path is skipped when OPENAI_API_KEY is unset."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        workflow = DeepResearchWorkflow(fast_path=True)
+        workflow.output_dir = tmp_path
+        workflow._execute_compiled = AsyncMock()
+        workflow._plan_and_approve = AsyncMock(side_effect=Exception("full workflow"))
+
+        with pytest.raises(Exception, match="full workflow"):
+            await workflow.execute("Short topic")
+
+        workflow._execute_compiled.assert_not_awaited()
+        workflow._plan_and_approve.assert_awaited_once()
+
+    def test_should_compile_skips_topics_needing_web_search(self):
+        """Test topics about recent events are not compiled."""
+        from agents.compiled import should_compile
+
+        assert should_compile("History of the Roman aqueducts")
+        assert not should_compile("Latest developments in battery chemistry")
+        assert not should_compile("GPU market share in 2025")
+
+    @pytest.mark.asyncio
+    async def test_run_compiled_rejects_missing_stages(self, monkeypatch):
+        """Test run_compiled raises when the response lacks a stage."""
+        from agents import compiled
+
+        llm = Mock()
+        llm.achat = AsyncMock(
+            return_value=Mock(message=Mock(content=json.dumps({"plan": "p"})))
+        )
+        monkeypatch.setattr(compiled, "_llm_server", lambda *args: llm)
+
+        with pytest.raises(compiled.CompiledOutputError, match="missing stages"):
+            await compiled.run_compiled("Topic", "key", "config.yaml")
+
 
 class TestErrorHandling:
     """Test error handling and recovery."""
@@ -294,6 +742,155 @@ class TestErrorHandling:
         assert result is not None
         assert isinstance(result, str)
 
+    @pytest.mark.asyncio
+    async def test_scrape_reuses_recent_pages(self, monkeypatch):
+        """Test repeated and concurrent scrapes of one URL fetch it once."""
+        from collections import OrderedDict
+
+        from mcp_server import research_server
+
+        fetched = []
+
+        class FakeScraper:
+            async def scrape_website(self, url):
+                fetched.append(url)
+                await asyncio.sleep(0.01)
+                return f"content of {url}"
+
+        monkeypatch.setattr(research_server, "_scraper", FakeScraper)
+        monkeypatch.setattr(research_server, "_scrape_cache", OrderedDict())
+
+        url = "https://example.com"
+        first, second = await asyncio.gather(
+            research_server.scrape(url), research_server.scrape(url)
+        )
+        third = await research_server.scrape(url)
+
+        assert first == second == third == f"content of {url}"
+        assert fetched == [url]
+
+    @pytest.mark.asyncio
+    async def test_multi_search_reports_each_provider(self, monkeypatch):
+        """Test multi_search keeps results when one provider fails."""
+        from mcp_server import research_server
+
+        async def ok(query, max_results=5):
+            return f"results for {query}"
+
+        async def broken(query, max_results=5):
+            raise RuntimeError("provider down")
+
+        monkeypatch.setitem(research_server.SEARCH_PROVIDERS, "ddg", ok)
+        monkeypatch.setitem(research_server.SEARCH_PROVIDERS, "arxiv", broken)
+
+        result = json.loads(
+            await research_server.multi_search("topic", ["ddg", "arxiv"])
+        )
+
+        assert result["ddg"] == "results for topic"
+        assert "provider down" in result["arxiv"]
+
+    @pytest.mark.asyncio
+    async def test_partial_recovery_runs_items_concurrently(self):
+        """Test partial recovery overlaps items and keeps results in item order."""
+        from error_recovery import partial_recovery
+
+        running = set()
+        overlapped = []
+
+        async def process(item):
+            running.add(item)
+            await asyncio.sleep(0.01)
+            overlapped.append(len(running))
+            running.discard(item)
+            if item == 2:
+                raise ValueError("bad item")
+            return item * 10
+
+        successful, failed = await partial_recovery([1, 2, 3], process)
+
+        assert successful == [10, 30]
+        assert failed == [{"item": 2, "error": "bad item"}]
+        assert max(overlapped) == 3
+
+    @pytest.mark.asyncio
+    async def test_error_history_is_bounded(self):
+        """Test ResilientOperation keeps only the most recent errors."""
+        from error_recovery import ERROR_HISTORY_SIZE, ResilientOperation
+
+        async def fail(n):
+            raise ValueError(f"failure {n}")
+
+        operation = ResilientOperation(fail)
+        for n in range(ERROR_HISTORY_SIZE + 5):
+            with pytest.raises(ValueError):
+                await operation.execute(n)
+
+        assert len(operation.error_history) == ERROR_HISTORY_SIZE
+        assert operation.error_history[-1][1] == f"failure {ERROR_HISTORY_SIZE + 4}"
+
+    def test_categorize_error_by_type(self):
+        """Test every exception type in the table maps to its category."""
+        import anthropic
+        import httpx
+        import pydantic
+
+        from error_recovery import ErrorCategory, categorize_error
+
+        request = httpx.Request("GET", "https://example.com")
+        response = httpx.Response(500, request=request)
+
+        class Model(pydantic.BaseModel):
+            count: int
+
+        try:
+            Model(count="many")
+        except pydantic.ValidationError as e:
+            validation_error = e
+
+        cases = [
+            (asyncio.TimeoutError(), ErrorCategory.TIMEOUT_ERROR),
+            (TimeoutError(), ErrorCategory.TIMEOUT_ERROR),
+            (anthropic.APITimeoutError(request=request), ErrorCategory.TIMEOUT_ERROR),
+            (anthropic.APIConnectionError(request=request), ErrorCategory.NETWORK_ERROR),
+            (
+                anthropic.APIStatusError("server error", response=response, body=None),
+                ErrorCategory.API_ERROR,
+            ),
+            (httpx.ReadTimeout("slow", request=request), ErrorCategory.TIMEOUT_ERROR),
+            (httpx.ConnectError("refused", request=request), ErrorCategory.NETWORK_ERROR),
+            (
+                httpx.HTTPStatusError("server error", request=request, response=response),
+                ErrorCategory.API_ERROR,
+            ),
+            (validation_error, ErrorCategory.VALIDATION_ERROR),
+            (ConnectionResetError(), ErrorCategory.NETWORK_ERROR),
+            (MemoryError(), ErrorCategory.RESOURCE_ERROR),
+        ]
+        for error, category in cases:
+            assert categorize_error(error) == category, type(error).__name__
+
+    def test_categorize_error_falls_back_to_message(self):
+        """Test the type table wins over the message, and ValueError uses the message."""
+        from error_recovery import (
+            ErrorCategory,
+            ErrorSeverity,
+            categorize_error,
+            get_error_severity,
+        )
+
+        try:
+            json.loads("not json")
+        except json.JSONDecodeError as e:
+            decode_error = e
+
+        assert categorize_error(ConnectionError("invalid state")) == ErrorCategory.NETWORK_ERROR
+        assert categorize_error(RuntimeError("api timeout")) == ErrorCategory.TIMEOUT_ERROR
+        assert categorize_error(ValueError("invalid topic")) == ErrorCategory.VALIDATION_ERROR
+        assert categorize_error(ValueError("connection reset")) == ErrorCategory.NETWORK_ERROR
+        assert categorize_error(decode_error) == ErrorCategory.UNKNOWN_ERROR
+        assert get_error_severity(decode_error) != ErrorSeverity.CRITICAL
+
 
 class TestDocumentTools:
     """Test document processing tools."""
@@ -341,6 +938,19 @@ class TestDocumentTools:
         assert result is not None
         assert "Sub Heading 1" in result or "Sub" in result
 
+    @pytest.mark.asyncio
+    async def test_html_conversion_handles_every_emphasis_span(self):
+        """Test every bold and italic span is converted, not only the first."""
+        from mcp_server.document_server import format_as_html
+
+        result = await format_as_html(
+            "Title", "**one** and **two**, *three* and *four*\n\nNext"
+        )
+
+        assert "<strong>one</strong> and <strong>two</strong>" in result
+        assert "<em>three</em> and <em>four</em>" in result
+        assert "</p><p>Next" in result
+
 
 class TestAsyncOperations:
     """Test async/await operations."""
@@ -356,6 +966,27 @@ class TestAsyncOperations:
 
         assert result == "complete"
 
+    def test_shared_client_works_across_event_loops(self):
+        """Test one shared HTTP client serves requests from separate event loops."""
+        import httpx
+
+        from utils.http import _per_loop_transport
+
+        pools = []
+
+        def make_pool():
+            pools.append(httpx.MockTransport(lambda request: httpx.Response(200, text="ok")))
+            return pools[-1]
+
+        client = httpx.AsyncClient(transport=_per_loop_transport(make_pool))
+
+        async def fetch():
+            return (await client.get("https://example.com")).text
+
+        assert asyncio.run(fetch()) == "ok"
+        assert asyncio.run(fetch()) == "ok"
+        assert len(pools) == 2
+
 
 class TestDataPersistence:
     """Test data persistence and state management."""
@@ -374,6 +1005,217 @@ class TestDataPersistence:
         assert loaded["user_prompt"] == "Test prompt"
         assert "áéíóú" in loaded["draft_report"]
 
+    def test_database_stores_epoch_timestamps(self, tmp_path):
+        """Test workflows record creation and completion as epoch microseconds."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.update_workflow("wf", status="completed")
+        workflow = db.get_workflow("wf")
+        db.close()
+
+        assert isinstance(workflow["created_at_us"], int)
+        assert workflow["completed_at_us"] >= workflow["created_at_us"]
+
+    def test_bulk_save_workflows(self, tmp_path):
+        """Test several workflows are saved in one call."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflows_bulk([("wf1", "First prompt"), ("wf2", "Second prompt")], "submitted")
+
+        assert db.get_workflow("wf1")["user_prompt"] == "First prompt"
+        assert db.get_workflow("wf2")["status"] == "submitted"
+        db.close()
+
+    def test_save_workflow_keeps_stored_fields(self, tmp_path):
+        """Test saving an existing workflow again updates it in place."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.update_workflow("wf", draft_report="Draft")
+        db.save_workflow("wf", "Test prompt", status="completed")
+        workflow = db.get_workflow("wf", include_reports=True)
+        db.close()
+
+        assert workflow["draft_report"] == "Draft"
+        assert workflow["status"] == "completed"
+
+    def test_bulk_records_single_transaction(self, tmp_path):
+        """Test bulk note, iteration and search inserts are all stored."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.add_research_notes_bulk("wf", [("Note 1", None, None, None), ("Note 2", "url", "title", "web")])
+        db.record_iterations_bulk("wf", [(1, "review", "draft", "feedback", None)])
+        db.record_searches_bulk("wf", [("web", "query", 5), ("scholar", "query", 2)])
+
+        stats = db.get_statistics("wf")
+        db.close()
+
+        assert stats["notes"] == 2
+        assert stats["iterations"] == 1
+        assert stats["searches"] == 2
+
+    def test_upsert_workflow_creates_then_updates(self, tmp_path):
+        """Test upsert inserts a new workflow and keeps unset fields on update."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.upsert_workflow("wf", "Test prompt", research_plan="Plan")
+        db.upsert_workflow("wf", status="completed", final_report="Report")
+        workflow = db.get_workflow("wf", include_reports=True)
+        db.close()
+
+        assert workflow["user_prompt"] == "Test prompt"
+        assert workflow["research_plan"] == "Plan"
+        assert workflow["final_report"] == "Report"
+        assert workflow["status"] == "completed"
+
+    def test_large_reports_round_trip_compressed(self, tmp_path):
+        """Test report fields are compressed at rest and restored on read."""
+        from database import WorkflowDatabase
+
+        report = "Report with special chars: áéíóú\n" * 200
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.update_workflow("wf", draft_report=report, summary="Short summary")
+
+        stored = db.connection.execute(
+            "SELECT typeof(draft_report), typeof(summary) FROM workflows"
+        ).fetchone()
+        workflow = db.get_workflow("wf", include_reports=True)
+        db.close()
+
+        assert stored == ("blob", "text")
+        assert workflow["draft_report"] == report
+        assert workflow["summary"] == "Short summary"
+
+    def test_research_notes_are_namedtuples(self, tmp_path):
+        """Test research notes are returned as rows with named fields."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        note_id = db.add_research_note("wf", "Note", source_url="https://example.com")
+        notes = db.get_research_notes("wf")
+        db.close()
+
+        assert notes[0].id == note_id
+        assert notes[0].note_content == "Note"
+        assert notes[0].source_url == "https://example.com"
+
+    def test_iter_research_notes_streams_in_chunks(self, tmp_path):
+        """Test streamed notes match the full list across fetch chunks."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.add_research_notes_bulk("wf", [(f"Note {i}", None, None, None) for i in range(450)])
+
+        streamed = [note.note_content for note in db.iter_research_notes("wf")]
+        notes = db.get_research_notes("wf")
+        db.close()
+
+        assert len(streamed) == 450
+        assert streamed == [note.note_content for note in notes]
+
+    def test_schema_version_is_recorded(self, tmp_path):
+        """Test reopening a database at the current schema keeps its data."""
+        from database import _SCHEMA_VERSION, WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+        db.close()
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        version = db.connection.execute("PRAGMA user_version").fetchone()[0]
+        workflow = db.get_workflow("wf")
+        db.close()
+
+        assert version == _SCHEMA_VERSION
+        assert workflow["user_prompt"] == "Test prompt"
+
+    def test_background_writes_are_flushed(self, tmp_path):
+        """Test queued writes are committed before reads and on close."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"), background_writes=True)
+        db.save_workflow("wf", "Test prompt")
+        for i in range(50):
+            db.add_research_note("wf", f"Note {i}")
+            db.record_search("wf", "web", f"query {i}", 1)
+
+        assert len(db.get_research_notes("wf")) == 50
+        db.record_iteration("wf", 1, "review", "draft", "feedback")
+        db.close()
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        stats = db.get_statistics("wf")
+        db.close()
+
+        assert stats["searches"] == 50
+        assert stats["iterations"] == 1
+
+    def test_failed_background_write_reaches_futures(self, tmp_path, monkeypatch):
+        """Test a failed background batch sets the error on every queued write."""
+        import database
+        from database import WorkflowDatabase
+
+        # Long enough for both writes to land in one batch
+        monkeypatch.setattr(database, "_WRITE_WINDOW_S", 0.5)
+        db = WorkflowDatabase(str(tmp_path / "test.db"), background_writes=True)
+        db.connection.execute("DROP TABLE search_history")
+        note = db.add_research_note("wf", "Note")
+        search = db.record_search("wf", "web", "query", 1)
+        db.flush()
+
+        assert isinstance(search.exception(), database.sqlite3.Error)
+        assert note.exception() is search.exception()
+        db.close()
+
+    def test_soft_deleted_workflows_are_hidden(self, tmp_path):
+        """Test soft-deleted workflows disappear from lookups and history."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+
+        assert db.soft_delete("wf") is True
+        assert db.soft_delete("wf") is False
+        assert db.get_workflow("wf") is None
+        assert db.get_workflow_history() == []
+        db.close()
+
+    def test_transaction_rolls_back_all_writes(self, tmp_path):
+        """Test writes inside a failed transaction are discarded together."""
+        from database import WorkflowDatabase
+
+        db = WorkflowDatabase(str(tmp_path / "test.db"))
+        db.save_workflow("wf", "Test prompt")
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.add_research_note("wf", "Note")
+                db.record_search("wf", "web", "query", 5)
+                raise RuntimeError("abort")
+
+        with db.transaction():
+            db.update_workflow("wf", status="completed")
+            db.record_iteration("wf", 1, "review", "draft", "feedback")
+
+        workflow = db.get_workflow("wf")
+        stats = db.get_statistics("wf")
+        db.close()
+
+        assert workflow["status"] == "completed"
+        assert stats["notes"] == 0
+        assert stats["searches"] == 0
+        assert stats["iterations"] == 1
+
 
 # Performance benchmarks
 
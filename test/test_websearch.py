@@ -1,22 +1,13 @@
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from tools.web_search import DuckDuckGoWebSearch, TavilyWebSearch, WebScraper
 from dotenv import load_dotenv
 import pytest
 from unittest.mock import patch
-import sys
 import os
 import json
 
 # Load environment variables from a .env file
 load_dotenv()
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Load environment variables from a .env file
-load_dotenv()
-
 # Install pytest-asyncio first: pip install pytest-asyncio
 
 class TestTavilyWebSearch:
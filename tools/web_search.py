@@ -1,4 +1,3 @@
-from tavily import AsyncTavilyClient # type: ignore
 import aiohttp
 import json
 from bs4 import BeautifulSoup
@@ -20,6 +19,9 @@ class TavilyWebSearch:
     def __init__(self, api_key: str | None):
         if api_key is None:
             raise ValueError("API key is required")
+        # Imported here so loading this module doesn't pay for the Tavily SDK
+        from tavily import AsyncTavilyClient # type: ignore
+
         self.client = AsyncTavilyClient(api_key=api_key)
 
     async def search(self, query: str, max_results: int = 10) -> list[dict[str, str]]:
@@ -83,7 +85,26 @@ class WebScraper:
         Initialize the WebScraper with necessary configurations.
         """
         self.data_dir = "data"
-        
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use.
+
+        Reusing one session keeps connections to a host alive between scrapes
+        instead of paying for a new TCP and TLS handshake on every call.
+        """
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=5)  # Set a timeout for the request
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     async def _scrape_website(self, url: str) -> str | Exception:
         """
         Fetch the content of a website, focusing on main article content.
@@ -99,142 +120,141 @@ class WebScraper:
         if not url.startswith(('http://', 'https://')):
             raise ValueError("Invalid URL format. Must start with http:// or https://")
         try:
-            timeout = aiohttp.ClientTimeout(total=5)  # Set a timeout for the request
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        content: str = await response.text()
-                        soup: BeautifulSoup = BeautifulSoup(content, 'html.parser')
-                        
-                        # Remove unwanted elements globally
-                        for element in soup.find_all([
-                            'script', 'style', 'nav', 'header', 'footer', 'aside',
-                            'form', 'button', 'iframe', 'noscript', 'svg', 'meta',
-                            'link', 'input', 'select', 'textarea'
-                        ]):
-                            element.decompose()
-                        
-                        # Remove common navigation/promotional elements
-                        for element in soup.find_all(attrs={
-                            'class': lambda x: bool(x and any(
-                                term in ' '.join(x).lower() for term in [
-                                    'nav', 'menu', 'sidebar', 'footer', 'header', 'ad',
-                                    'advertisement', 'promo', 'banner', 'social', 'share',
-                                    'comment', 'cookie', 'popup', 'modal'
-                                ]
-                            ))
-                        }):
-                            element.decompose()
-                        
-                        # Try multiple selectors to find main content
-                        content_selectors = [
-                            'main',
-                            'article', 
-                            '[role="main"]',
-                            '.content',
-                            '.article',
-                            '.post',
-                            '.entry',
-                            '#content',
-                            '#main',
-                            '.main-content',
-                            'body'
-                        ]
-                        
-                        main_content = None
-                        for selector in content_selectors:
-                            main_content = soup.select_one(selector)
-                            if main_content:
-                                break
-                        
-                        if main_content is None:
-                            main_content = soup.body or soup
+            session = self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    content: str = await response.text()
+                    soup: BeautifulSoup = BeautifulSoup(content, 'html.parser')
+                    
+                    # Remove unwanted elements globally
+                    for element in soup.find_all([
+                        'script', 'style', 'nav', 'header', 'footer', 'aside',
+                        'form', 'button', 'iframe', 'noscript', 'svg', 'meta',
+                        'link', 'input', 'select', 'textarea'
+                    ]):
+                        element.decompose()
+                    
+                    # Remove common navigation/promotional elements
+                    for element in soup.find_all(attrs={
+                        'class': lambda x: bool(x and any(
+                            term in ' '.join(x).lower() for term in [
+                                'nav', 'menu', 'sidebar', 'footer', 'header', 'ad',
+                                'advertisement', 'promo', 'banner', 'social', 'share',
+                                'comment', 'cookie', 'popup', 'modal'
+                            ]
+                        ))
+                    }):
+                        element.decompose()
+                    
+                    # Try multiple selectors to find main content
+                    content_selectors = [
+                        'main',
+                        'article', 
+                        '[role="main"]',
+                        '.content',
+                        '.article',
+                        '.post',
+                        '.entry',
+                        '#content',
+                        '#main',
+                        '.main-content',
+                        'body'
+                    ]
+                    
+                    main_content = None
+                    for selector in content_selectors:
+                        main_content = soup.select_one(selector)
+                        if main_content:
+                            break
+                    
+                    if main_content is None:
+                        main_content = soup.body or soup
+                    
+                    # Extract title
+                    title = ""
+                    title_element = (soup.find('h1') or 
+                                   soup.find('title') or 
+                                   main_content.find('h1'))
+                    if title_element:
+                        title = title_element.get_text(strip=True)
+                    
+                    # Extract all meaningful text content
+                    text_elements = main_content.find_all([
+                        'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
+                        'p', 'div', 'span', 'li', 'td', 'th'
+                    ])
+                    
+                    # Collect all text and links
+                    content_parts = []
+                    links = []
+                    seen_texts = set()
+                    
+                    for element in text_elements:
+                        text = element.get_text(strip=True)
                         
-                        # Extract title
-                        title = ""
-                        title_element = (soup.find('h1') or 
-                                       soup.find('title') or 
-                                       main_content.find('h1'))
-                        if title_element:
-                            title = title_element.get_text(strip=True)
+                        # Skip empty, very short, or duplicate text
+                        if not text or len(text) < 10 or text in seen_texts:
+                            continue
                         
-                        # Extract all meaningful text content
-                        text_elements = main_content.find_all([
-                            'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
-                            'p', 'div', 'span', 'li', 'td', 'th'
-                        ])
+                        seen_texts.add(text)
                         
-                        # Collect all text and links
-                        content_parts = []
-                        links = []
-                        seen_texts = set()
+                        # Add heading formatting
+                        if element.name.startswith('h'): # type: ignore
+                            content_parts.append(f"\n{text}\n")
+                        else:
+                            content_parts.append(text)
                         
-                        for element in text_elements:
-                            text = element.get_text(strip=True)
-                            
-                            # Skip empty, very short, or duplicate text
-                            if not text or len(text) < 10 or text in seen_texts:
-                                continue
-                            
-                            seen_texts.add(text)
+                        # Extract links from this element
+                        for link in element.find_all('a', href=True):
+                            href = link.get('href')
+                            link_text = link.get_text(strip=True)
                             
-                            # Add heading formatting
-                            if element.name.startswith('h'): # type: ignore
-                                content_parts.append(f"\n{text}\n")
-                            else:
-                                content_parts.append(text)
-                            
-                            # Extract links from this element
-                            for link in element.find_all('a', href=True):
-                                href = link.get('href')
-                                link_text = link.get_text(strip=True)
+                            if href and link_text:
+                                # Convert relative URLs to absolute
+                                if href.startswith('/'):
+                                    href = urljoin(url, href)
                                 
-                                if href and link_text:
-                                    # Convert relative URLs to absolute
-                                    if href.startswith('/'):
-                                        href = urljoin(url, href)
-                                    
-                                    links.append({
-                                        "url": href,
-                                        "text": link_text
-                                    })
-                        
-                        # Extract lists separately for better structure
-                        lists = []
-                        for ul in main_content.find_all(['ul', 'ol']):
-                            list_items = []
-                            for li in ul.find_all('li'):
-                                item_text = li.get_text(strip=True)
-                                if item_text and len(item_text) > 3:
-                                    list_items.append(item_text)
-                            
-                            if list_items:
-                                lists.append({
-                                    "type": "ordered" if ul.name == 'ol' else "unordered",
-                                    "items": list_items
+                                links.append({
+                                    "url": href,
+                                    "text": link_text
                                 })
+                    
+                    # Extract lists separately for better structure
+                    lists = []
+                    for ul in main_content.find_all(['ul', 'ol']):
+                        list_items = []
+                        for li in ul.find_all('li'):
+                            item_text = li.get_text(strip=True)
+                            if item_text and len(item_text) > 3:
+                                list_items.append(item_text)
                         
-                        # Build result object
-                        result = {
-                            "url": url,
-                            "title": title,
-                            "content": "\n".join(content_parts),
-                            "links": links[:50],  # Limit to first 50 links
-                            "lists": lists[:10],  # Limit to first 10 lists
-                            "word_count": len(' '.join(content_parts).split())
-                        }
-                        
-                        return json.dumps(result, indent=2, ensure_ascii=False)
-                    elif response.status == 404:
-                        raise Exception
-                    elif response.status == 403:
-                        raise Exception
-                    elif response.status == 408:
-                        raise Exception
-                    elif response.status == 429:
-                        raise Exception
-                    else:
-                        return Exception(f"Error fetching {url}: HTTP {response.status}")
+                        if list_items:
+                            lists.append({
+                                "type": "ordered" if ul.name == 'ol' else "unordered",
+                                "items": list_items
+                            })
+                    
+                    # Build result object
+                    result = {
+                        "url": url,
+                        "title": title,
+                        "content": "\n".join(content_parts),
+                        "links": links[:50],  # Limit to first 50 links
+                        "lists": lists[:10],  # Limit to first 10 lists
+                        "word_count": len(' '.join(content_parts).split())
+                    }
+                    
+                    return json.dumps(result, indent=2, ensure_ascii=False)
+                elif response.status == 404:
+                    raise Exception
+                elif response.status == 403:
+                    raise Exception
+                elif response.status == 408:
+                    raise Exception
+                elif response.status == 429:
+                    raise Exception
+                else:
+                    return Exception(f"Error fetching {url}: HTTP {response.status}")
         except Exception as e:
             raise Exception(f"Error fetching {url}: {str(e)}")
         
@@ -1,13 +1,22 @@
 import yaml
 import os
+from functools import lru_cache
 from typing import Dict, Any
 from dataclasses import dataclass, field
 
-@dataclass
+# Model used for each agent tier unless overridden under provider.tiers in config.yaml
+DEFAULT_MODEL_TIERS: Dict[str, str] = {
+    "nano": "gpt-4.1-nano",
+    "mini": "gpt-4.1-mini",
+    "full": "gpt-4.1",
+}
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration class for the application."""
+    """Configuration class for the application. Instances are shared, so they are frozen."""
     provider: str = "openai"
     model: str = "gpt-4.1-mini"
+    model_tiers: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_MODEL_TIERS))
     temperature: float = 0.7
     max_tokens: int = 1000
     top_p: float = 1.0
@@ -21,9 +30,13 @@ class Config:
     port: int = 7860
 
 def load_config(file_path: str) -> Config:
+    """Load a config file, parsing each path again only when its mtime changes."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Configuration file not found: {file_path}")
-    
+    return _load_cached(os.path.abspath(file_path), os.path.getmtime(file_path))
+
+@lru_cache(maxsize=8)
+def _load_cached(file_path: str, mtime: float) -> Config:
     try:
         with open(file_path, 'r') as file:
             config_data: Dict[str, Any] = yaml.safe_load(file)
@@ -42,6 +55,7 @@ def load_config(file_path: str) -> Config:
     return Config(
         provider=provider.get("name", "openai"),
         model=provider.get("model", "gpt-4.1-mini"),
+        model_tiers={**DEFAULT_MODEL_TIERS, **provider.get("tiers", {})},
         temperature=model_settings.get("temperature", 0.7),
         max_tokens=model_settings.get("max_tokens", 1000),
         top_p=model_settings.get("top_p", 1.0),
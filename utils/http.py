@@ -0,0 +1,58 @@
+import asyncio
+from functools import cache
+from typing import TYPE_CHECKING, Callable
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def _per_loop_transport(factory: Callable[[], "httpx.AsyncBaseTransport"]) -> "httpx.AsyncBaseTransport":
+    """Return a transport that gives each running event loop its own pool from ``factory``.
+
+    Pooled connections belong to the loop that opened them, so one client
+    can be shared by code running under different loops (``asyncio.run`` in
+    scripts and tests, worker threads) without reusing another loop's sockets.
+    """
+    import httpx
+
+    class PerLoopTransport(httpx.AsyncBaseTransport):
+        def __init__(self) -> None:
+            self._pools: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncBaseTransport]" = (
+                WeakKeyDictionary()
+            )
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            loop = asyncio.get_running_loop()
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = factory()
+            return await pool.handle_async_request(request)
+
+        async def aclose(self) -> None:
+            # Only the running loop can close its connections; pools of other
+            # loops are dropped along with their loops
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+            if pool is not None:
+                await pool.aclose()
+
+    return PerLoopTransport()
+
+
+@cache
+def get_shared_async_client() -> "httpx.AsyncClient":
+    """Return the process-wide async HTTP client shared by all LLM clients."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    return httpx.AsyncClient(
+        transport=_per_loop_transport(lambda: httpx.AsyncHTTPTransport(limits=limits)),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+
+
+async def aclose_shared_async_client() -> None:
+    """Close the shared client, if it was created, releasing pooled connections."""
+    if get_shared_async_client.cache_info().currsize:
+        await get_shared_async_client().aclose()
+        get_shared_async_client.cache_clear()
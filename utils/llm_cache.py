@@ -0,0 +1,79 @@
+"""On-disk cache of Anthropic message responses keyed by the full request."""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+LLM_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", ".cache/llm"))
+LLM_CACHE_TTL_SECONDS = 86400
+
+
+def request_cache_key(**kwargs: Any) -> str:
+    """Return the cache key for a messages.create request; equal requests give equal keys."""
+    payload = json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        if time.time() - path.stat().st_mtime > LLM_CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"text": text}), encoding="utf-8")
+
+
+async def _stream_text(client: Any, **kwargs: Any) -> str:
+    """Stream a response, collecting its text as it arrives."""
+    chunks = []
+    async with client.messages.stream(**kwargs) as stream:
+        async for text in stream.text_stream:
+            chunks.append(text)
+    return "".join(chunks)
+
+
+async def cached_create(
+    client: Any, *, stream: bool = False, cache: bool = True, **kwargs: Any
+) -> str:
+    """
+    Call ``client.messages.create``, serving repeated identical requests from disk.
+
+    The key covers every request argument (model, system, messages,
+    max_tokens, ...), so any change to the prompt misses the cache.
+
+    Args:
+        client: AsyncAnthropic client
+        stream: Receive the response incrementally via ``messages.stream``,
+            which suits long generations; the result is the same text
+        cache: Read and write the on-disk cache; when False the request
+            always reaches the client
+        **kwargs: Arguments for messages.create
+
+    Returns:
+        Text of the first content block of the response
+    """
+    path = LLM_CACHE_DIR / f"{request_cache_key(**kwargs)}.json"
+
+    if cache:
+        hit = await asyncio.to_thread(_read, path)
+        if hit is not None:
+            return hit
+
+    if stream:
+        text = await _stream_text(client, **kwargs)
+    else:
+        message = await client.messages.create(**kwargs)
+        text = message.content[0].text
+
+    if cache:
+        await asyncio.to_thread(_write, path, text)
+    return text